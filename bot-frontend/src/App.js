@@ -1,7 +1,7 @@
 import React, {useState} from 'react';
 import './App.css';
 import SpeechToText from "./services/speech-to-text";
-import {sendMsgAndGetReply} from "./services/bot-bridge";
+import {sendMsgAndGetReply, sendVoiceMsgAndGetReply, sendInterimTranscript} from "./services/bot-bridge";
 import illustration from './res/illustration_1.png';
 import bot from './res/bot.png';
 
@@ -29,7 +29,9 @@ function App() {
             }
         ]);
 
-        sendMsgAndGetReply(msg).then(([reply, predictedIntent]) => {
+        // voice messages (with a speech-to-text confidence) go through the streaming channel
+        const send = speechToTextConfidence ? sendVoiceMsgAndGetReply : sendMsgAndGetReply;
+        send(msg).then(([reply, predictedIntent]) => {
             setMessages(messages => [
                 ...messages.slice(0, -1),
                 {
@@ -73,7 +75,7 @@ const InputBox = (props) => {
         setListeningToUser(listeningToUser => !listeningToUser);
     };
 
-    const speechToTextConverter = new SpeechToText(onUserVoiceInput, onAudioStateChanged);
+    const speechToTextConverter = new SpeechToText(onUserVoiceInput, onAudioStateChanged, sendInterimTranscript);
 
     const sendUserInput = () => {
         const inputTextField = document.getElementById("input");
@@ -1,22 +1,63 @@
 import axios from 'axios';
 
 const API_HOST = 'http://127.0.0.1:5005';
-const BOT_ENDPOINT = `${API_HOST}/webhooks/rest/webhook`;
-const PREDICT_ENDPOINT = `${API_HOST}/conversations/0/messages`;
+const BOT_ENDPOINT = `${API_HOST}/webhooks/rest_nlu/webhook`;
+const STREAM_ENDPOINT = `${API_HOST.replace(/^http/, 'ws')}/webhooks/stream/ws`;
+
+// each page session is a separate conversation
+const SENDER_ID = `user-${Math.random().toString(36).slice(2)}`;
 
 export const sendMsgAndGetReply = async (msg) => {
-    const [response, prediction] = await Promise.all([
-        axios.post(BOT_ENDPOINT, {
-            sender: "anonymus",
-            message: msg
-        }),
-        axios.post(PREDICT_ENDPOINT, {
-            sender: "user",
-            text: msg
-        })]);
-
-    return [
-        response.data?.[0]?.text || "Am întâmpinat o eroare 😥",
-        prediction.data.latest_message.intent
-    ];
-};
\ No newline at end of file
+    // the replies, the intent and the semantic roles come from a single processing of the message
+    const response = await axios.post(BOT_ENDPOINT, {
+        sender: SENDER_ID,
+        message: msg
+    });
+
+    return botReply(response.data);
+};
+
+const botReply = (data) => [
+    data.messages?.[0]?.text || "Am întâmpinat o eroare 😥",
+    data.intent || {name: "-", confidence: 0},
+    data.semantic_roles
+];
+
+// WebSocket used for voice input, opened on first use
+let stream = null;
+let pendingReplies = [];
+
+const openStream = () => {
+    if (stream && stream.readyState <= WebSocket.OPEN)
+        return stream;
+
+    stream = new WebSocket(STREAM_ENDPOINT);
+    stream.onmessage = (event) => {
+        const data = JSON.parse(event.data);
+        if (data.type === "bot" && pendingReplies.length)
+            pendingReplies.shift()(botReply(data));
+    };
+    stream.onclose = () => {
+        pendingReplies.forEach(resolve => resolve(botReply({})));
+        pendingReplies = [];
+    };
+    return stream;
+};
+
+const sendOverStream = (event) => {
+    const ws = openStream();
+    if (ws.readyState === WebSocket.OPEN)
+        ws.send(JSON.stringify(event));
+    else
+        ws.addEventListener("open", () => ws.send(JSON.stringify(event)), {once: true});
+};
+
+export const sendInterimTranscript = (text) => {
+    sendOverStream({type: "interim", text});
+};
+
+export const sendVoiceMsgAndGetReply = (msg) => new Promise(resolve => {
+    // the bot started parsing the interim transcripts of the message, so it can answer sooner
+    pendingReplies.push(resolve);
+    sendOverStream({type: "final", sender: SENDER_ID, message: msg});
+});
\ No newline at end of file
@@ -1,16 +1,25 @@
 const SpeechRecognition = window.webkitSpeechRecognition;
 
 class SpeechToText {
-    constructor(onSpeechResult, onAudioStateChanged) {
+    constructor(onSpeechResult, onAudioStateChanged, onInterimResult) {
         let recognition = new SpeechRecognition();
         this.recognition = recognition;
         recognition.lang = 'ro-RO';
-        recognition.interimResults = false;
+        // interim transcripts are sent ahead, so the bot can start parsing before the user stops speaking
+        recognition.interimResults = true;
         recognition.maxAlternatives = 1;
 
         recognition.onresult = function (event) {
-            const speechResult = event.results[0][0].transcript.toLowerCase();
-            const confidence = event.results[0][0].confidence.toFixed(2);
+            const result = event.results[event.results.length - 1];
+            const speechResult = result[0].transcript.toLowerCase();
+
+            if (!result.isFinal) {
+                if (onInterimResult)
+                    onInterimResult(speechResult);
+                return;
+            }
+
+            const confidence = result[0].confidence.toFixed(2);
             onSpeechResult(speechResult, confidence);
         };
 
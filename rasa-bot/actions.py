@@ -7,12 +7,32 @@ from rasa_sdk import Action, Tracker
 from rasa_sdk.executor import CollectingDispatcher
 from rasa_sdk.events import SlotSet
 from rasa_sdk.forms import FormAction
+import os
 import re
 
 from knowledge_base.db_bridge import DbBridge
+from knowledge_base.memory_bridge import MemoryBridge
+from knowledge_base.session_replicas import ReplicatedBridge
 from knowledge_base.types import InfoType
-
-db_bridge = DbBridge()
+from knowledge_base.vector_index import Embedder
+import metrics
+
+# port of the HTTP server exposing the latency metrics of the action server (GET /metrics)
+METRICS_PORT = 5056
+
+# KB_VECTORS=<spaCy model> enables the recall of the stored entities by the similarity of their word vectors
+embedder = Embedder(os.environ['KB_VECTORS']) if os.environ.get('KB_VECTORS') else None
+
+# KB_BACKEND=memory replaces the Neo4j database with an in-process graph (offline runs, load tests); the reads from
+# Neo4j are served by in-process replicas of the senders' partitions, up to KB_REPLICA_SIZE nodes and relations
+if os.environ.get('KB_BACKEND') == 'memory':
+    db_bridge = MemoryBridge(embedder)
+else:
+    db_bridge = ReplicatedBridge(DbBridge(embedder), max_size=int(os.environ.get('KB_REPLICA_SIZE', 200000)))
+# KB_SEED=<file.jsonl> loads a graph exported by knowledge_base/graph_io.py (e.g. a benchmark dataset) at startup
+if os.environ.get('KB_SEED'):
+    db_bridge.import_graph(os.environ['KB_SEED'])
+metrics.start_http_server(METRICS_PORT)
 entity_extraction_failure_msg = "Nu am putut extrage entitățile"
 
 
@@ -23,6 +43,7 @@ class ActionStoreAttribute(Action):
     def name(self) -> Text:
         return "action_store_attr"
 
+    @metrics.timed_action
     def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         # get user's utterance (request)
         message = tracker.latest_message
@@ -41,7 +62,7 @@ class ActionStoreAttribute(Action):
 
         # insert data into the database
         if entity and value:
-            db_bridge.set_value(entity, value)
+            db_bridge.set_value(entity, value, sender=tracker.sender_id)
         else:
             dispatcher.utter_message(entity_extraction_failure_msg)
 
@@ -55,6 +76,7 @@ class ActionGetAttribute(Action):
     def name(self) -> Text:
         return "action_get_attr"
 
+    @metrics.timed_action
     def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         # get user's utterance (request)
         message = tracker.latest_message
@@ -70,7 +92,7 @@ class ActionGetAttribute(Action):
 
         # query the database
         if entity:
-            result = db_bridge.get_value(entity)
+            result = db_bridge.get_value(entity, sender=tracker.sender_id)
             dispatcher.utter_message(result)
         else:
             dispatcher.utter_message(entity_extraction_failure_msg)
@@ -84,6 +106,7 @@ class ActionStoreLocation(Action):
     def name(self) -> Text:
         return "action_store_location"
 
+    @metrics.timed_action
     def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         message = tracker.latest_message
 
@@ -101,7 +124,7 @@ class ActionStoreLocation(Action):
 
         # query the database
         if entity and location:
-            db_bridge.set_value(entity, location, type=InfoType.LOC)
+            db_bridge.set_value(entity, location, type=InfoType.LOC, sender=tracker.sender_id)
         else:
             dispatcher.utter_message(entity_extraction_failure_msg)
         return []
@@ -114,6 +137,7 @@ class ActionGetLocation(Action):
     def name(self) -> Text:
         return "action_get_location"
 
+    @metrics.timed_action
     def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         message = tracker.latest_message
 
@@ -127,7 +151,7 @@ class ActionGetLocation(Action):
                 entity = ent
 
         if entity:
-            result = db_bridge.get_value(entity, type=InfoType.LOC)
+            result = db_bridge.get_value(entity, type=InfoType.LOC, sender=tracker.sender_id)
             dispatcher.utter_message(result)
         else:
             dispatcher.utter_message(entity_extraction_failure_msg)
@@ -196,6 +220,7 @@ class ActionGetTime(Action):
     def name(self) -> Text:
         return "action_get_time"
 
+    @metrics.timed_action
     def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         message = tracker.latest_message
 
@@ -224,10 +249,10 @@ class ActionGetTime(Action):
 
         if entity:
             if is_simple_event:
-                result = db_bridge.get_value(entity, type=info_type)
+                result = db_bridge.get_value(entity, type=info_type, sender=tracker.sender_id)
             else:
                 sentence_components = extract_sentence_components(semantic_roles)
-                result = db_bridge.get_action_time(sentence_components, info_type)
+                result = db_bridge.get_action_time(sentence_components, info_type, sender=tracker.sender_id)
             dispatcher.utter_message(result)
         else:
             dispatcher.utter_message(entity_extraction_failure_msg)
@@ -241,6 +266,7 @@ class ActionStoreTime(Action):
     def name(self) -> Text:
         return "action_store_time"
 
+    @metrics.timed_action
     def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         message = tracker.latest_message
 
@@ -268,10 +294,11 @@ class ActionStoreTime(Action):
 
         if entity:
             if is_simple_event:
-                db_bridge.set_value(entity, (time['pre'] + " " + time['ext_value']).strip(), type=info_type)
+                db_bridge.set_value(entity, (time['pre'] + " " + time['ext_value']).strip(), type=info_type,
+                                    sender=tracker.sender_id)
             else:
                 sentence_components = extract_sentence_components(semantic_roles)
-                db_bridge.store_action(sentence_components)
+                db_bridge.store_action(sentence_components, sender=tracker.sender_id)
         else:
             dispatcher.utter_message(entity_extraction_failure_msg)
         return []
@@ -284,6 +311,7 @@ class ActionKeepRawAttrEntity(Action):
     def name(self) -> Text:
         return "action_keep_raw_attr_entity"
 
+    @metrics.timed_action
     def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         message = tracker.latest_message
 
@@ -320,6 +348,7 @@ class RawDataStoreForm(FormAction):
             "raw_attr_val": self.from_text(),  # the raw value is actually the whole text entered by the user
         }
 
+    @metrics.timed_action
     def submit(
             self,
             dispatcher: CollectingDispatcher,
@@ -330,5 +359,5 @@ class RawDataStoreForm(FormAction):
 
         raw_attr_entity = tracker.get_slot("raw_attr_entity")
         raw_attr_val = tracker.get_slot("raw_attr_val")
-        db_bridge.set_value(raw_attr_entity, raw_attr_val, type=InfoType.VAL)
+        db_bridge.set_value(raw_attr_entity, raw_attr_val, type=InfoType.VAL, sender=tracker.sender_id)
         return [SlotSet("raw_attr_val", None)]
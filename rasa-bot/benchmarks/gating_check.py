@@ -0,0 +1,99 @@
+"""
+Check that the intent gating counters of the SyntacticParser match the parses that actually ran: the messages of the
+NLU data are processed as in the pipeline (with their annotated intent as the prediction of the classifier), the calls
+of the parse are counted, and every gated message must be either skipped (its parse never ran) or discarded (its parse
+ran anyway, only with `concurrent: true`).
+
+In the concurrent mode, the time of the featurizers and the intent classifier is simulated by a sleep between the start
+of the parse and the join.
+
+Run from the rasa-bot folder:
+    python -m benchmarks.gating_check
+    python -m benchmarks.gating_check -c -t 20
+"""
+
+import re
+import time
+
+import plac
+from rasa.nlu.training_data import Message
+
+from metrics import SKIPPED_PARSES, DISCARDED_PARSES
+from syntactic_parser import SyntacticParser, PENDING_SEMANTIC_ROLES
+
+NLU_DATA = './data/nlu.md'
+
+
+def read_intent_examples(file=NLU_DATA):
+    """ Yield the (text, intent) examples of a Rasa NLU markdown file. """
+
+    intent = None
+    with open(file, encoding='utf-8') as f:
+        for line in f:
+            header = re.match(r'## intent:(\S+)', line)
+            if header:
+                intent = header.group(1)
+            elif intent and line.startswith('- '):
+                yield re.sub(r'\[([^\]]*)\]\([^)]*\)', r'\1', line[2:].strip()), intent
+
+
+def counted(counter):
+    return sum(counter.series.values())
+
+
+@plac.annotations(
+    concurrent=("Parse in the worker thread and join after the simulated classifier", "flag", "c"),
+    classifier_time=("Simulated time (ms) of the featurizers and the intent classifier", "option", "t", float),
+)
+def main(concurrent=False, classifier_time=10.0):
+    parser = SyntacticParser({"concurrent": concurrent})
+    role_intents = parser.component_config["role_intents"]
+
+    # count the parses that run, on the worker thread or on the caller's
+    parses = 0
+    semantic_roles = parser.semantic_roles
+
+    def counting_semantic_roles(text):
+        nonlocal parses
+        parses += 1
+        return semantic_roles(text)
+
+    parser.semantic_roles = counting_semantic_roles
+
+    skipped, discarded = counted(SKIPPED_PARSES), counted(DISCARDED_PARSES)
+    examples = list(read_intent_examples())
+    for text, intent in examples:
+        message = Message(text)
+        if concurrent:
+            parser.process(message)
+            time.sleep(classifier_time / 1000)
+            message.set("intent", {"name": intent, "confidence": 1.0})
+            message.get(PENDING_SEMANTIC_ROLES)(message)
+        else:
+            message.set("intent", {"name": intent, "confidence": 1.0})
+            parser.process(message)
+
+    if parser.executor:
+        # the discarded parses still run
+        parser.executor.shutdown(wait=True)
+
+    gated = sum(intent not in role_intents for _, intent in examples)
+    skipped, discarded = counted(SKIPPED_PARSES) - skipped, counted(DISCARDED_PARSES) - discarded
+    print(f'{len(examples)} messages, {gated} gated: {skipped} skipped, {discarded} discarded, {parses} parses')
+
+    errors = []
+    if skipped + discarded != gated:
+        errors.append(f'{gated} gated messages, but {skipped + discarded} skipped or discarded')
+    if parses != len(examples) - skipped:
+        errors.append(f'{len(examples) - skipped} messages not skipped, but {parses} parses')
+    if not concurrent and discarded:
+        errors.append(f'{discarded} discarded parses without the concurrent mode')
+
+    for error in errors:
+        print('MISMATCH', error)
+    if errors:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    plac.call(main)
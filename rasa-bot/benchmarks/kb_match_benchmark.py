@@ -0,0 +1,116 @@
+"""
+Latency and database hits of the noun phrase matches: independent match clauses (the former builder) vs the single
+connected pattern compiled by `QueryBuilder.query_match_noun_phrase`.
+
+The Neo4j database is populated with objects owned by people ("al cui") and placed in their rooms ("care"), then
+the details of random objects are requested through phrases of increasing depth, e.g. "sertarul meu",
+"sertarul meu din cameră", "sertarul meu din camera mea". The benchmark nodes are removed at the end.
+
+Run from the rasa-bot folder (with the Neo4j database started):
+    python -m benchmarks.kb_match_benchmark -n 2000
+"""
+
+import random
+import time
+
+import plac
+
+from benchmarks.load_test import percentile
+from knowledge_base.db_bridge import DbBridge, QueryBuilder
+from knowledge_base.types import InfoType
+
+PREFIX = "bench-"
+OWNERS = ["eu", "el", "ea"]
+
+
+def legacy_match_noun_phrase(entity):
+    """ The former match builder: one independent match clause per specifier. """
+
+    QueryBuilder.id += 1
+    eid = f'n{QueryBuilder.id}'
+
+    query = f' match ({eid})-[:IS_A*0..1]->({{value: "{entity["lemma"]}", pre: "{entity.get("pre", "")}"}})'
+
+    for spec in entity['specifiers']:
+        inner_query, inner_id = legacy_match_noun_phrase(spec)
+        query += inner_query
+
+        if spec['question'] in ['care', 'ce fel de']:
+            query += f' match ({eid})-[:SPEC]->({inner_id})'
+        elif spec['question'] == 'al cui':
+            query += f' match ({inner_id})-[:HAS]->({eid})'
+
+    return query, eid
+
+
+BUILDERS = {"legacy": legacy_match_noun_phrase, "compiled": QueryBuilder.query_match_noun_phrase}
+
+
+def noun(lemma, pre="", specifiers=()):
+    return {"value": lemma, "lemma": lemma, "pre": pre, "specifiers": list(specifiers)}
+
+
+def owner(lemma):
+    return dict(noun(lemma), question="al cui")
+
+
+def phrase(obj, obj_owner, room, room_owner, depth):
+    """ Object phrase with 1 (owner), 2 (owner, room) or 3 (owner, room and its owner) specifiers. """
+
+    specifiers = [owner(obj_owner)]
+    if depth >= 2:
+        room_specifiers = [owner(room_owner)] if depth >= 3 else []
+        specifiers.append(dict(noun(room, "din", room_specifiers), question="care"))
+
+    return noun(obj, specifiers=specifiers)
+
+
+def db_hits(profile):
+    """ Total database hits of a query profile (the plan tree of the operators). """
+
+    return profile.get("dbHits", 0) + sum(db_hits(child) for child in profile.get("children", []))
+
+
+@plac.annotations(
+    n_objects=("Number of stored objects", "option", "n", int),
+    n_rooms=("Number of distinct rooms", "option", "r", int),
+    queries=("Number of queries per phrase depth and builder", "option", "q", int),
+)
+def main(n_objects=2000, n_rooms=50, queries=200):
+    bridge = DbBridge()
+    rng = random.Random(7)
+
+    print(f'storing {n_objects} objects')
+    stored = []
+    for i in range(n_objects):
+        args = (f'{PREFIX}obiect{i % (n_objects // 10 or 1)}', rng.choice(OWNERS),
+                f'{PREFIX}cameră{rng.randrange(n_rooms)}', rng.choice(OWNERS))
+        query, node_id, _ = QueryBuilder.query_create_noun_phrase(phrase(*args, depth=3), match_existing=True)
+        bridge.session.run(query + f' create ({node_id})-[:VAL]->(:val {{value: "{PREFIX}{i}"}})').consume()
+        stored.append(args)
+
+    try:
+        print(f'\n{"depth":6}{"builder":10}{"p50 ms":>9}{"p95 ms":>9}{"db hits":>10}{"rows":>7}')
+        for depth in [1, 2, 3]:
+            for name, builder in BUILDERS.items():
+                latencies, hits, rows = [], 0, 0
+                for args in random.Random(depth).sample(stored, min(queries, len(stored))):
+                    query, node_id = builder(phrase(*args, depth=depth))
+                    query += f' match ({node_id})-[:{InfoType.VAL.value}]->(val) return val'
+
+                    start = time.perf_counter()
+                    rows += len(list(bridge.session.run(query)))
+                    latencies.append(time.perf_counter() - start)
+                    hits += db_hits(bridge.session.run('profile' + query).summary().profile)
+
+                latencies.sort()
+                print(f'{depth:<6}{name:10}{percentile(latencies, 50) * 1000:9.2f}'
+                      f'{percentile(latencies, 95) * 1000:9.2f}{hits / len(latencies):10.0f}{rows:7}')
+    finally:
+        bridge.session.run(f'match (c:class) where c.value starts with "{PREFIX}" '
+                           f'optional match (c)<-[:IS_A]-(i) optional match (i)-[:VAL]->(v) '
+                           f'detach delete c, i, v').consume()
+
+
+if __name__ == "__main__":
+    plac.call(main)
@@ -0,0 +1,123 @@
+"""
+Check that the in-process knowledge base (MemoryBridge) behaves like the Neo4j one (DbBridge): the same conversations
+are replayed against both bridges, then the answers of their reads and the graphs they stored (the partitions of the
+sender of the check) are compared.
+
+The conversations cover the noun phrase shapes of the stories: owners ("al cui"), qualifiers ("care") with
+prepositions, quantities ("cât", not linked to their entity), locations and actions with their details. The nodes
+created by the check are removed at the end.
+
+Run from the rasa-bot folder (with the Neo4j database started):
+    python -m benchmarks.kb_parity_check
+"""
+
+import json
+import uuid
+from collections import Counter
+
+import plac
+
+from knowledge_base.db_bridge import DbBridge
+from knowledge_base.memory_bridge import MemoryBridge
+from knowledge_base.types import InfoType
+
+PREFIX = "parity-"
+
+
+def noun(lemma, value=None, pre="", question=None, specifiers=()):
+    """ Entity of a noun of the check; the nouns get a prefix, so their class nodes can be removed at the end. """
+
+    entity = {"lemma": PREFIX + lemma, "value": PREFIX + (value or lemma), "pre": pre,
+              "specifiers": list(specifiers)}
+    if question:
+        entity["question"] = question
+    return entity
+
+
+def owner(lemma, value):
+    return {"lemma": lemma, "value": value, "pre": "", "question": "al cui", "specifiers": []}
+
+
+KEY = noun("cheie", "cheia", specifiers=[owner("eu", "mea")])
+GLASSES = noun("ochelari", "ochelarii")
+DRAWER = noun("sertar", "sertarul", "în", specifiers=[
+    noun("cameră", "camera", "din", "care", [owner("eu", "mea")])])
+CATS = noun("pisică", "pisicile", specifiers=[noun("doi", "două", question="cât")])
+BOOK = noun("carte", "cartea", specifiers=[noun("roșu", "roșie", question="care")])
+TABLE = noun("masă", pre="pe")
+ME = {"lemma": "eu", "value": "eu", "pre": "", "specifiers": []}
+
+
+def action(time=()):
+    return {"subj": ME, "action": "pune", "ce": BOOK, "loc": [TABLE], "time": list(time)}
+
+
+# conversations of (operation, arguments) turns
+CONVERSATIONS = [
+    [("set_value", (KEY, "1234")), ("get_value", (KEY,)), ("set_value", (KEY, "5678")), ("get_value", (KEY,))],
+    [("set_value", (GLASSES, DRAWER, InfoType.LOC)), ("get_value", (GLASSES, InfoType.LOC))],
+    [("set_value", (CATS, "Tom și Jerry")), ("get_value", (CATS,))],
+    [("store_action", (action([("ieri", InfoType.TIME_POINT)]),)),
+     ("get_action_time", (action(), InfoType.TIME_POINT))],
+]
+
+
+def answer_lines(answer):
+    """ The lines of an answer, in a fixed order (the databases return the results in any order). """
+
+    return sorted(answer.split('\n'))
+
+
+def partition(bridge, sender):
+    """ The nodes and the relations of the partition of a sender, identified by their labels and properties. """
+
+    records = list(bridge.export_records(sender))
+    nodes = {record["node"]: (tuple(sorted(record["labels"])), json.dumps(record["properties"], sort_keys=True))
+             for record in records if "node" in record}
+    relations = Counter((record["rel"], nodes[record["start"]], nodes[record["end"]])
+                        for record in records if "rel" in record)
+    return Counter(nodes.values()), relations
+
+
+def compare(name, expected, actual):
+    if expected == actual:
+        return True
+
+    print(f'{name} differ:')
+    if isinstance(expected, Counter):
+        print(f'  only in Neo4j: {list((expected - actual).elements())}')
+        print(f'  only in memory: {list((actual - expected).elements())}')
+    else:
+        print(f'  Neo4j: {expected}\n  memory: {actual}')
+    return False
+
+
+def main():
+    db, memory = DbBridge(), MemoryBridge()
+    sender = PREFIX + uuid.uuid4().hex
+    mismatches = 0
+
+    try:
+        for conversation in CONVERSATIONS:
+            for operation, args in conversation:
+                answers = [getattr(bridge, operation)(*args, sender=sender) for bridge in [db, memory]]
+                if operation.startswith('get'):
+                    ok = compare(f'answers of {operation}', *map(answer_lines, answers))
+                    mismatches += not ok
+                    print(f'{"ok" if ok else "MISMATCH"} {operation}: {answers[1]!r}')
+
+        for name, expected, actual in zip(["nodes", "relations"], partition(db, sender), partition(memory, sender)):
+            ok = compare(f'stored {name}', expected, actual)
+            mismatches += not ok
+            print(f'{"ok" if ok else "MISMATCH"} stored {name}: {sum(actual.values())}')
+    finally:
+        db.session.run('match (n)-[{sender: $sender}]-() where not n:class detach delete n', sender=sender).consume()
+        db.session.run('match (c:class) where c.value starts with $prefix detach delete c', prefix=PREFIX).consume()
+
+    print(f'{mismatches} mismatches')
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    plac.call(main)
@@ -0,0 +1,112 @@
+"""
+Memory and lookup speed of the lemma tables: spaCy lookup tables vs compressed automata (lemma_trie.py).
+
+Each representation of the tables is loaded in a fresh process, which reports the memory allocated by the tables
+(tracemalloc), the growth of its RSS, the load time and the lookup time of all the forms and of as many missing
+words. Both representations are written by drafts/compile_lemmas.py.
+
+Run from the rasa-bot folder:
+    python -m benchmarks.lemma_tables_benchmark
+"""
+
+import os
+import random
+import resource
+import time
+import tracemalloc
+from multiprocessing import Pool
+
+import plac
+from spacy.lookups import Lookups
+
+from lemma_trie import LemmaTrie, TRIE_SUFFIX
+
+LOOKUPS_PATH = './data/lookups'
+TABLES = ["noun-lemmas", "prop-noun-lemmas", "verb-lemmas"]
+
+
+def load_spacy_tables(lookups_path):
+    lookups = Lookups()
+    lookups.from_disk(lookups_path)
+    return [lookups.get_table(table) for table in TABLES]
+
+
+def load_tries(lookups_path):
+    return [LemmaTrie.from_disk(os.path.join(lookups_path, table + TRIE_SUFFIX)) for table in TABLES]
+
+
+LOADERS = {"spacy": load_spacy_tables, "trie": load_tries}
+
+
+def measure(args):
+    """ Load the tables and time their lookups (run in a fresh worker process). """
+
+    representation, lookups_path, words = args
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    start = time.perf_counter()
+    tables = LOADERS[representation](lookups_path)
+    load_time = time.perf_counter() - start
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    found = sum(1 for lemmas, table_words in zip(tables, words) for word in table_words
+                if lemmas.get(word, None) is not None)
+    lookup_time = time.perf_counter() - start
+
+    return {
+        "allocated_mb": allocated / 2 ** 20,
+        "rss_mb": (rss_after - rss_before) / 1024,
+        "load_s": load_time,
+        "lookup_ns": lookup_time / sum(len(table_words) for table_words in words) * 1e9,
+        "found": found,
+    }
+
+
+def missing_words(forms, count, seed=7):
+    """ Alter random letters of the forms, to look up words absent from the table. """
+
+    rng = random.Random(seed)
+    forms = list(forms)
+    words = set()
+    while forms and len(words) < count:
+        form = rng.choice(forms)
+        i = rng.randrange(len(form))
+        words.add(form[:i] + rng.choice('qwxyz') + form[i + 1:])
+
+    return list(words)
+
+
+@plac.annotations(
+    lookups_path=("Directory of the lookup tables", "option", "l", str),
+)
+def main(lookups_path=LOOKUPS_PATH):
+    words = []
+    for table in TABLES:
+        trie_file = os.path.join(lookups_path, table + TRIE_SUFFIX)
+        if not os.path.exists(trie_file):
+            print(f'{trie_file} not found, compile the tables with drafts/compile_lemmas.py')
+            return
+
+        # the spaCy tables only store the hashes of the forms
+        forms = [form for form, _ in LemmaTrie.from_disk(trie_file).items()]
+        words.append(forms + missing_words(forms, len(forms)))
+        print(f'{table}: {len(forms)} forms')
+
+    print(f'\n{"":8}{"alloc MB":>10}{"RSS MB":>10}{"load s":>10}{"lookup ns":>11}{"found":>9}')
+    results = {}
+    for representation in LOADERS:
+        # one process per representation, so the memory of the other one is not counted
+        with Pool(1) as pool:
+            results[representation] = r = pool.apply(measure, ((representation, lookups_path, words),))
+
+        print(f'{representation:8}{r["allocated_mb"]:10.1f}{r["rss_mb"]:10.1f}{r["load_s"]:10.3f}'
+              f'{r["lookup_ns"]:11.0f}{r["found"]:9}')
+
+    print(f'\nmemory reduction: {results["spacy"]["allocated_mb"] / results["trie"]["allocated_mb"]:.1f}x')
+
+if __name__ == "__main__":
+    plac.call(main)
@@ -0,0 +1,187 @@
+"""
+Load generator that replays the NLU test set and the training stories against the running RASA and action servers.
+
+Each simulated sender plays whole conversations (a single utterance for the NLU test set, a sequence of turns for a
+story) through the REST channel; latencies are grouped by the expected intent and by the actions of each turn.
+
+For offline runs start the action server with the in-process knowledge base:
+    KB_BACKEND=memory rasa run actions
+    rasa run -m models --enable-api
+    python -m benchmarks.load_test -s 32 -n 2000
+"""
+
+import json
+import random
+import re
+import time
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+import plac
+
+REST_ENDPOINT = "http://127.0.0.1:5005/webhooks/rest/webhook"
+
+
+def read_nlu_examples(file):
+    """ Read the examples of each intent from a Markdown NLU file (entity annotations are removed). """
+
+    examples = defaultdict(list)
+    intent = None
+    with open(file, encoding="utf-8") as f:
+        for line in f:
+            if line.startswith('##'):
+                intent = line.split(':')[1].strip() if line.startswith('## intent:') else None
+            elif intent and line.startswith('- '):
+                examples[intent].append(re.sub(r'\[([^\]]*)\]\([^)]*\)', r'\1', line[2:].strip()))
+
+    return examples
+
+
+def read_stories(file):
+    """ Read the stories as lists of (intent, [actions]) turns. """
+
+    stories = []
+    turns = None
+    with open(file, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith('##'):
+                turns = []
+                stories.append(turns)
+            elif line.startswith('* '):
+                turns.append((line[2:].split('{')[0].strip(), []))
+            elif line.startswith('- ') and turns:
+                action = line[2:].strip()
+                if not action.startswith('form{'):
+                    turns[-1][1].append(action)
+
+    return [story for story in stories if story]
+
+
+def build_conversations(nlu_examples, stories, fallback_examples):
+    """
+    Build the replayed conversations: every NLU test example on its own and one conversation per story, with
+    each intent uttered through a random example of that intent.
+    """
+
+    conversations = [[(text, intent, [])] for intent, texts in nlu_examples.items() for text in texts]
+
+    for story in stories:
+        conversation = []
+        for intent, actions in story:
+            texts = nlu_examples.get(intent) or fallback_examples.get(intent)
+            if not texts:
+                break
+            conversation.append((random.choice(texts), intent, actions))
+        else:
+            conversations.append(conversation)
+
+    return conversations
+
+
+def percentile(sorted_values, p):
+    """ Nearest-rank percentile of a sorted list. """
+
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, int(round(p / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def summarize(latencies):
+    values = sorted(latencies)
+    return {
+        "count": len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+    }
+
+
+class LoadTest:
+    def __init__(self, endpoint, timeout):
+        self.endpoint = endpoint
+        self.timeout = timeout
+        self.lock = Lock()
+        self.by_intent = defaultdict(list)
+        self.by_action = defaultdict(list)
+        self.errors = 0
+        self.turns = 0
+
+    def send(self, sender, text):
+        body = json.dumps({"sender": sender, "message": text}).encode("utf-8")
+        request = urllib.request.Request(self.endpoint, data=body, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read().decode("utf-8"))
+
+    def play(self, sender, conversation):
+        for text, intent, actions in conversation:
+            start = time.perf_counter()
+            try:
+                self.send(sender, text)
+            except Exception:
+                with self.lock:
+                    self.errors += 1
+                continue
+            latency = time.perf_counter() - start
+
+            with self.lock:
+                self.turns += 1
+                self.by_intent[intent].append(latency)
+                for action in actions:
+                    self.by_action[action].append(latency)
+
+    def run(self, conversations, num_senders, num_conversations):
+        """ Replay `num_conversations` random conversations, `num_senders` at a time. """
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=num_senders) as executor:
+            for i in range(num_conversations):
+                executor.submit(self.play, f"load-test-{i}", random.choice(conversations))
+        duration = time.perf_counter() - start
+
+        return {
+            "duration": duration,
+            "turns": self.turns,
+            "errors": self.errors,
+            "throughput": self.turns / duration if duration else 0,
+            "intents": {intent: summarize(values) for intent, values in sorted(self.by_intent.items())},
+            "actions": {action: summarize(values) for action, values in sorted(self.by_action.items())},
+        }
+
+
+def print_report(report):
+    print(f'Turns: {report["turns"]}, errors: {report["errors"]}, duration: {report["duration"]:.1f} s, '
+          f'throughput: {report["throughput"]:.1f} turns/s')
+
+    for group in ["intents", "actions"]:
+        print(f'\n{group.capitalize():<30}{"count":>8}{"p50 ms":>10}{"p95 ms":>10}{"p99 ms":>10}')
+        for name, stats in report[group].items():
+            print(f'{name:<30}{stats["count"]:>8}' +
+                  ''.join(f'{stats[p] * 1000:>10.1f}' for p in ["p50", "p95", "p99"]))
+
+
+@plac.annotations(
+    senders=("Number of concurrent simulated senders", "option", "s", int),
+    conversations=("Number of conversations to replay", "option", "n", int),
+    endpoint=("URL of the REST channel of the RASA server", "option", "e", str),
+    timeout=("Timeout of a request (seconds)", "option", "t", float),
+    output=("JSON file where the report is saved", "option", "o", str),
+)
+def main(senders=16, conversations=1000, endpoint=REST_ENDPOINT, timeout=30.0, output=None):
+    nlu_examples = read_nlu_examples('data/nlu_test.md')
+    conversation_pool = build_conversations(nlu_examples, read_stories('data/stories.md'),
+                                            read_nlu_examples('data/nlu.md'))
+
+    report = LoadTest(endpoint, timeout).run(conversation_pool, senders, conversations)
+    print_report(report)
+
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    plac.call(main)
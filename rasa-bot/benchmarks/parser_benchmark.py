@@ -0,0 +1,193 @@
+"""
+Throughput and latency benchmark of the syntactic parser, bucketed by sentence length and dependency tree depth.
+
+The spaCy parse and the semantic roles extraction of `SyntacticParser` are timed separately over:
+- the test sentences of the parser (drafts/data/syntactic/test),
+- synthetic run-on sentences (test sentences chained with conjunctions, like long dictated utterances),
+- the sentences of the book in drafts/data/carti.
+
+Run from the rasa-bot folder:
+    python -m benchmarks.parser_benchmark -o benchmarks/baselines/parser.json
+    python -m benchmarks.parser_benchmark -c benchmarks/baselines/parser.json
+"""
+
+import json
+import random
+import re
+import resource
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+
+import plac
+
+from benchmarks.load_test import percentile
+from syntactic_dataset import TEST_PATH, read_examples
+from syntactic_parser import SyntacticParser
+
+# upper bounds (number of tokens) of the sentence length buckets
+LENGTH_BUCKETS = [5, 10, 20, 40, 80, 160]
+LENGTH_BUCKET_NAMES = [f'<={bound}' for bound in LENGTH_BUCKETS] + [f'>{LENGTH_BUCKETS[-1]}']
+CONJUNCTIONS = ["și", "iar", "dar", "apoi", "pentru că", "când"]
+
+
+def test_sentences():
+    return [text for text, _ in read_examples(TEST_PATH)]
+
+
+def synthetic_sentences(sentences, count, max_clauses):
+    """ Build run-on sentences by chaining 2..max_clauses random sentences with conjunctions. """
+
+    rng = random.Random(13)
+    result = []
+    for _ in range(count):
+        clauses = rng.sample(sentences, rng.randint(2, max_clauses))
+        text = clauses[0]
+        for clause in clauses[1:]:
+            text += f' {rng.choice(CONJUNCTIONS)} {clause}'
+        result.append(text)
+
+    return result
+
+
+def book_sentences(file, limit):
+    with open(file, encoding="utf-8") as f:
+        text = ' '.join(line.strip() for line in f)
+
+    sentences = [s.strip() for s in re.split(r'(?<=[.!?])\s+', text) if len(s.split()) > 1]
+    return sentences[:limit]
+
+
+def tree_depth(doc):
+    def depth(token):
+        return 1 + max((depth(child) for child in token.children), default=0)
+
+    return max((depth(token) for token in doc if token.head == token), default=0)
+
+
+def length_bucket(num_tokens):
+    for bound, name in zip(LENGTH_BUCKETS, LENGTH_BUCKET_NAMES):
+        if num_tokens <= bound:
+            return name
+    return LENGTH_BUCKET_NAMES[-1]
+
+
+def summarize(samples):
+    """ Aggregate (num_tokens, parse time, roles time) samples. """
+
+    parse = sorted(s[1] for s in samples)
+    roles = sorted(s[2] for s in samples)
+    tokens = sum(s[0] for s in samples)
+
+    return {
+        "sentences": len(samples),
+        "tokens": tokens,
+        "tokens_per_sec": tokens / (sum(parse) + sum(roles)),
+        "parse_ms": {f'p{p}': percentile(parse, p) * 1000 for p in [50, 95, 99]},
+        "roles_ms": {f'p{p}': percentile(roles, p) * 1000 for p in [50, 95, 99]},
+    }
+
+
+def run_corpus(parser, sentences):
+    samples = []
+    by_length = defaultdict(list)
+    by_depth = defaultdict(list)
+
+    for text in sentences:
+        start = time.perf_counter()
+        doc = parser.nlp_spacy(text.lower())
+        parsed = time.perf_counter()
+        parser.extract_semantic_roles(doc)
+        end = time.perf_counter()
+
+        sample = (len(doc), parsed - start, end - parsed)
+        samples.append(sample)
+        by_length[length_bucket(len(doc))].append(sample)
+        by_depth[tree_depth(doc)].append(sample)
+
+    return {
+        "total": summarize(samples),
+        "by_length": {bucket: summarize(s) for bucket, s in by_length.items()},
+        "by_depth": {str(depth): summarize(s) for depth, s in sorted(by_depth.items())},
+    }
+
+
+def peak_memory(parser, sentences):
+    """ Peak Python heap allocated while parsing the sentences (MB). """
+
+    tracemalloc.start()
+    for text in sentences:
+        parser.extract_semantic_roles(parser.nlp_spacy(text.lower()))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return peak / 2 ** 20
+
+
+def compare(results, baseline):
+    print(f'\n{"Corpus":<12}{"tokens/s":>12}{"baseline":>12}{"change":>9}{"parse p95":>12}{"baseline":>12}')
+    for corpus, result in results["corpora"].items():
+        if corpus not in baseline["corpora"]:
+            continue
+        cur, old = result["total"], baseline["corpora"][corpus]["total"]
+        print(f'{corpus:<12}{cur["tokens_per_sec"]:>12.0f}{old["tokens_per_sec"]:>12.0f}'
+              f'{(cur["tokens_per_sec"] / old["tokens_per_sec"] - 1) * 100:>8.1f}%'
+              f'{cur["parse_ms"]["p95"]:>12.2f}{old["parse_ms"]["p95"]:>12.2f}')
+
+
+def print_results(results):
+    for corpus, result in results["corpora"].items():
+        print(f'\n{corpus} (peak heap {result["peak_memory_mb"]:.1f} MB)')
+        print(f'{"length":<10}{"sentences":>10}{"tokens/s":>10}{"parse p50":>11}{"p95":>8}{"p99":>8}'
+              f'{"roles p50":>11}{"p95":>8}{"p99":>8}')
+        rows = [(name, result["by_length"][name]) for name in LENGTH_BUCKET_NAMES if name in result["by_length"]]
+        for bucket, stats in rows + [("total", result["total"])]:
+            parse, roles = stats["parse_ms"], stats["roles_ms"]
+            print(f'{bucket:<10}{stats["sentences"]:>10}{stats["tokens_per_sec"]:>10.0f}'
+                  f'{parse["p50"]:>11.2f}{parse["p95"]:>8.2f}{parse["p99"]:>8.2f}'
+                  f'{roles["p50"]:>11.2f}{roles["p95"]:>8.2f}{roles["p99"]:>8.2f}')
+
+    print(f'\nMax RSS: {results["max_rss_mb"]:.1f} MB')
+
+
+@plac.annotations(
+    output=("JSON file where the results are saved as a baseline", "option", "o", str),
+    baseline=("JSON baseline to compare the results with", "option", "c", str),
+    synthetic=("Number of synthetic run-on sentences", "option", "s", int),
+    max_clauses=("Maximum number of clauses of a synthetic sentence", "option", "m", int),
+    book=("Maximum number of sentences from drafts/data/carti", "option", "b", int),
+    repeat=("Number of passes over each corpus", "option", "r", int),
+)
+def main(output=None, baseline=None, synthetic=300, max_clauses=8, book=2000, repeat=3):
+    parser = SyntacticParser()
+
+    corpora = {
+        "test": test_sentences(),
+        "synthetic": synthetic_sentences(test_sentences(), synthetic, max_clauses),
+        "book": book_sentences('drafts/data/carti', book),
+    }
+
+    # warm up the model
+    run_corpus(parser, corpora["test"][:20])
+
+    results = {"corpora": {}}
+    for name, sentences in corpora.items():
+        results["corpora"][name] = run_corpus(parser, sentences * repeat)
+        results["corpora"][name]["peak_memory_mb"] = peak_memory(parser, sentences)
+    results["max_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    print_results(results)
+
+    if baseline:
+        with open(baseline, encoding="utf-8") as f:
+            compare(results, json.load(f))
+
+    if output:
+        Path(output).parent.mkdir(parents=True, exist_ok=True)
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    plac.call(main)
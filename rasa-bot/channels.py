@@ -0,0 +1,241 @@
+"""
+Custom endpoints mounted on the RASA HTTP server (configured in credentials.yml).
+"""
+
+import asyncio
+import json
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Text
+
+from rasa.core.channels.channel import InputChannel, CollectingOutputChannel, RestInput, UserMessage
+from rasa.core.interpreter import NaturalLanguageInterpreter
+from sanic import Blueprint, response
+
+from metrics import REGISTRY, CONTENT_TYPE, SPECULATIVE_PARSES
+from parser_updater import submit_correction
+
+
+class NluRestInput(RestInput):
+    """
+    REST channel that returns the bot responses together with the intent and the semantic roles of the message, at
+    /webhooks/rest_nlu/webhook, so the web UI doesn't have to parse the message again through the HTTP API.
+
+    Body format: {"sender": "user-id", "message": "unde e cartea"}
+    Response format: {"messages": [{"recipient_id", "text"}, ...], "intent": {"name", "confidence"},
+                      "entities": [...], "semantic_roles": [...]}
+    """
+
+    @classmethod
+    def name(cls) -> Text:
+        return "rest_nlu"
+
+    def blueprint(self, on_new_message):
+        rest_nlu_webhook = Blueprint("rest_nlu_webhook", __name__)
+
+        @rest_nlu_webhook.route("/", methods=["GET"])
+        async def health(request):
+            return response.json({"status": "ok"})
+
+        @rest_nlu_webhook.route("/webhook", methods=["POST"])
+        async def receive(request):
+            sender_id = await self._extract_sender(request)
+            collector = CollectingOutputChannel()
+            await on_new_message(UserMessage(self._extract_message(request), collector, sender_id,
+                                             input_channel=self._extract_input_channel(request),
+                                             metadata=self.get_metadata(request)))
+
+            return response.json(bot_output(request.app.agent, sender_id, collector))
+
+        return rest_nlu_webhook
+
+
+def bot_output(agent, sender_id, collector):
+    """ Bot responses to the last message of the user, together with the parse of the message. """
+
+    # the parse of the message was stored in the conversation tracker by the same processing pass
+    tracker = agent.tracker_store.retrieve(sender_id)
+    parse_data = tracker.latest_message.parse_data if tracker else {}
+
+    return {
+        "messages": collector.messages,
+        "intent": parse_data.get("intent"),
+        "entities": parse_data.get("entities", []),
+        "semantic_roles": parse_data.get("semantic_roles", []),
+    }
+
+
+class SpeculativeInterpreter(NaturalLanguageInterpreter):
+    """
+    Wrapper of the NLU interpreter that parses the messages in a background thread and can parse the expected messages
+    ahead, reusing these parses when the messages arrive.
+    """
+
+    def __init__(self, interpreter, max_size=1000):
+        self.interpreter = interpreter
+        self.max_size = max_size
+        self.parses = OrderedDict()  # (sender id, text) -> parse of the next message of the sender
+        # the NLU pipeline is CPU bound, so it runs outside the event loop, in a single thread, since the spaCy
+        # pipeline is not thread-safe (the speculative parses and the parses of the messages never overlap)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="nlu")
+
+    def parse_sync(self, text, message_id=None, tracker=None):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self.interpreter.parse(text, message_id, tracker))
+        finally:
+            loop.close()
+
+    async def run_parse(self, text, message_id=None, tracker=None):
+        """ Parse a text in the NLU thread. """
+
+        return await asyncio.get_event_loop().run_in_executor(self.executor, self.parse_sync, text, message_id,
+                                                              tracker)
+
+    async def speculate(self, text):
+        """ Parse an expected message ahead. """
+
+        return await self.run_parse(text)
+
+    def expect(self, sender_id, text, parse_data):
+        """ Reuse a speculative parse for the next message of a sender, if it has the same text. """
+
+        self.parses[(sender_id, text)] = parse_data
+        if len(self.parses) > self.max_size:
+            self.parses.popitem(last=False)
+
+    async def parse(self, text, message_id=None, tracker=None):
+        sender_id = tracker.sender_id if tracker is not None else None
+        parse_data = self.parses.pop((sender_id, text), None)
+        if parse_data is None:
+            return await self.run_parse(text, message_id, tracker)
+        return parse_data
+
+
+class StreamingInput(InputChannel):
+    """
+    WebSocket channel for voice input, at /webhooks/stream/ws.
+
+    The client sends the interim transcripts of an utterance, then its final transcript (JSON messages):
+        {"type": "interim", "text": "unde e"}
+        {"type": "final", "sender": "user-id", "message": "unde e cartea"}
+    and the server pushes the answer to each final message, in the format of the rest_nlu channel:
+        {"type": "bot", "messages": [...], "intent": {...}, "entities": [...], "semantic_roles": [...]}
+
+    When an interim result repeats the previous one (the user paused, usually at the end of the utterance), the NLU
+    pipeline (intent classification and syntactic parsing) runs in the background on the transcript, so when the
+    final transcript is the same text, its parse is already available and only the dialogue policies run. The parse
+    of a partial transcript is never valid for a longer one, so the transcripts that are still growing are not parsed.
+    """
+
+    @classmethod
+    def name(cls) -> Text:
+        return "stream"
+
+    def blueprint(self, on_new_message):
+        stream_webhook = Blueprint("stream_webhook", __name__)
+
+        @stream_webhook.route("/", methods=["GET"])
+        async def health(request):
+            return response.json({"status": "ok"})
+
+        @stream_webhook.websocket("/ws")
+        async def stream(request, ws):
+            agent = request.app.agent
+            if not isinstance(agent.interpreter, SpeculativeInterpreter):
+                agent.interpreter = SpeculativeInterpreter(agent.interpreter)
+            interpreter = agent.interpreter
+
+            default_sender = str(uuid.uuid4())
+            transcript = ""
+            # speculative parse of this connection: the text to parse next, the running task and the last (text, parse)
+            speculation = {"next": None, "task": None, "parse": None}
+
+            async def speculate():
+                # parse only the latest stable transcript, one at a time
+                while speculation["next"] is not None:
+                    text, speculation["next"] = speculation["next"], None
+                    speculation["parse"] = (text, await interpreter.speculate(text))
+                speculation["task"] = None
+
+            while True:
+                try:
+                    event = json.loads(await ws.recv())
+                except ValueError:
+                    continue
+
+                if event.get("type") == "interim":
+                    text = ' '.join(event.get("text", "").split())
+                    stable = text and text == transcript
+                    transcript = text
+                    parsed_text = speculation["parse"][0] if speculation["parse"] else None
+                    if stable and text not in [parsed_text, speculation["next"]]:
+                        speculation["next"] = text
+                        if speculation["task"] is None:
+                            speculation["task"] = asyncio.ensure_future(speculate())
+
+                elif event.get("type") == "final":
+                    text = event.get("message", "").strip()
+                    transcript = ""
+                    speculation["next"] = None
+                    if speculation["task"] is not None:
+                        await asyncio.wait([speculation["task"]])
+
+                    sender_id = event.get("sender") or default_sender
+                    parsed, speculation["parse"] = speculation["parse"], None
+                    if parsed is not None and parsed[0] == ' '.join(text.split()):
+                        interpreter.expect(sender_id, text, parsed[1])
+                        SPECULATIVE_PARSES.inc("reused")
+                    else:
+                        SPECULATIVE_PARSES.inc("missed" if parsed is None else "wasted")
+
+                    collector = CollectingOutputChannel()
+                    await on_new_message(UserMessage(text, collector, sender_id, input_channel=self.name()))
+
+                    await ws.send(json.dumps(dict(bot_output(agent, sender_id, collector), type="bot")))
+
+        return stream_webhook
+
+
+class MetricsInput(InputChannel):
+    """ Expose the metrics of the NLU components at /webhooks/metrics/ in the Prometheus text format. """
+
+    @classmethod
+    def name(cls) -> Text:
+        return "metrics"
+
+    def blueprint(self, on_new_message):
+        metrics_webhook = Blueprint("metrics_webhook", __name__)
+
+        @metrics_webhook.route("/", methods=["GET"])
+        async def metrics(request):
+            return response.text(REGISTRY.render(), content_type=CONTENT_TYPE)
+
+        return metrics_webhook
+
+
+class CorrectionsInput(InputChannel):
+    """
+    Receive corrected parses of utterances at /webhooks/corrections/ for the online updates of the syntactic parser.
+
+    Body format: {"text": "unde e cartea", "heads": [0, 0, 0], "deps": ["unde", "ROOT", "cine"]}
+    """
+
+    @classmethod
+    def name(cls) -> Text:
+        return "corrections"
+
+    def blueprint(self, on_new_message):
+        corrections_webhook = Blueprint("corrections_webhook", __name__)
+
+        @corrections_webhook.route("/", methods=["POST"])
+        async def receive(request):
+            try:
+                submit_correction(request.json["text"], request.json["heads"], request.json["deps"])
+            except (KeyError, TypeError, ValueError) as e:
+                return response.json({"error": str(e)}, status=400)
+
+            return response.json({"status": "queued"})
+
+        return corrections_webhook
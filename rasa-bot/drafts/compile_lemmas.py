@@ -0,0 +1,242 @@
+"""
+Offline compiler of the lemma lookup tables (data/lookups) from a dexonline export.
+
+Instead of querying MySQL for every word (see DexBridge.lemmaForWord), the export is streamed once into a local
+SQLite database (only the columns needed for lemmatization) and the lemmas of all the inflected forms of a part of
+speech are resolved with a single join, sorted by form. Like DexBridge, the lemma of a form is the one of its
+lowest ranked inflection (then lowest variant) among the lexemes of that part of speech.
+
+Supported inputs:
+- a MySQL dump of dexonline (.sql or .sql.gz),
+- a directory with Lexeme.csv, InflectedForm.csv, Inflection.csv and ModelType.csv (with header rows),
+- an SQLite database that already contains these tables.
+
+Suffix rules are also learned from each table (see suffix_lemmatizer.py), to lemmatize the words missing from the
+tables. With --prune, the forms whose lemma is predicted by the rules are dropped from the tables. The known lemmas
+(the lexemes of the part of speech, the list of names for the proper nouns) that the rules would rewrite, or that are
+also forms of other lemmas, are added to the tables as their own lemma, and the compilation fails if the saved tables
+and rules still rewrite a known lemma.
+
+Each table is saved both in the spaCy lookups file and as a compressed automaton (<table>.trie, see lemma_trie.py),
+which is loaded by the SyntacticParser component when present.
+
+Run from the rasa-bot folder:
+    python -m drafts.compile_lemmas dexonline.sql.gz
+"""
+
+import csv
+import gzip
+import json
+import re
+import sqlite3
+from itertools import groupby
+from pathlib import Path
+
+import plac
+from spacy.lookups import Lookups
+
+from lemma_trie import LemmaTrie, TRIE_SUFFIX
+from suffix_lemmatizer import SuffixLemmatizer, load_rules, save_rules
+
+LOOKUPS_DIR = Path(__file__).parent.parent / 'data' / 'lookups'
+NAMES_FILE = Path(__file__).parent / 'data' / 'subst-proprii'
+
+# columns of the dexonline tables needed for lemmatization
+TABLES = {
+    "Lexeme": ["id", "formNoAccent", "modelType"],
+    "InflectedForm": ["lexemeId", "inflectionId", "formNoAccent", "variant"],
+    "Inflection": ["id", "rank"],
+    "ModelType": ["code", "description"],
+}
+
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS lexeme_id ON Lexeme(id)",
+    "CREATE INDEX IF NOT EXISTS inflection_id ON Inflection(id)",
+    "CREATE INDEX IF NOT EXISTS model_type_code ON ModelType(code)",
+]
+
+# lookup table -> word contained by the model type descriptions of its part of speech
+PARTS_OF_SPEECH = {
+    "noun-lemmas": "substantiv",
+    "verb-lemmas": "verb",
+}
+
+LEMMAS_QUERY = """
+    SELECT f.formNoAccent, l.formNoAccent
+    FROM InflectedForm f
+    JOIN Lexeme l ON l.id = f.lexemeId
+    JOIN Inflection i ON i.id = f.inflectionId
+    JOIN ModelType mt ON mt.code = l.modelType
+    WHERE lower(mt.description) LIKE ?
+    ORDER BY f.formNoAccent, CAST(i.rank AS INTEGER), CAST(f.variant AS INTEGER)
+"""
+
+LEXEMES_QUERY = """
+    SELECT DISTINCT l.formNoAccent
+    FROM Lexeme l
+    JOIN ModelType mt ON mt.code = l.modelType
+    WHERE lower(mt.description) LIKE ?
+"""
+
+BATCH_SIZE = 10000
+
+# tokens of the VALUES list of a MySQL INSERT statement
+SQL_VALUE_TOKEN = re.compile(r"'((?:[^'\\]|\\.)*)'|(NULL)|([^,()']+)|([(),])")
+SQL_ESCAPES = {'0': '\0', 'b': '\b', 'n': '\n', 'r': '\r', 't': '\t', 'Z': '\x1a'}
+
+
+def create_tables(db):
+    for table, columns in TABLES.items():
+        db.execute(f'CREATE TABLE IF NOT EXISTS {table} ({", ".join(f"`{c}`" for c in columns)})')
+
+
+def insert_rows(db, table, rows):
+    """ Insert rows (lists of the TABLES columns) in batches. """
+
+    placeholders = ", ".join("?" * len(TABLES[table]))
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == BATCH_SIZE:
+            db.executemany(f'INSERT INTO {table} VALUES ({placeholders})', batch)
+            batch = []
+    db.executemany(f'INSERT INTO {table} VALUES ({placeholders})', batch)
+
+
+def parse_sql_values(values):
+    """ Yield the tuples of the VALUES list of a MySQL INSERT statement. """
+
+    row = None
+    for match in SQL_VALUE_TOKEN.finditer(values):
+        string, null, literal, punctuation = match.groups()
+        if punctuation == '(':
+            row = []
+        elif punctuation == ')':
+            yield row
+            row = None
+        elif row is None or punctuation == ',':
+            continue
+        elif string is not None:
+            row.append(re.sub(r'\\(.)', lambda m: SQL_ESCAPES.get(m.group(1), m.group(1)), string))
+        elif null:
+            row.append(None)
+        elif literal.strip():
+            row.append(literal.strip())
+
+
+def import_sql_dump(dump, db):
+    """ Stream the rows of the needed tables of a MySQL dump into the database, one statement at a time. """
+
+    opener = gzip.open if str(dump).endswith('.gz') else open
+    columns = {}
+    table = None
+
+    with opener(dump, 'rt', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            create = re.match(r'CREATE TABLE `(\w+)`', line)
+            if create:
+                table = create.group(1)
+                columns[table] = []
+            elif table and re.match(r'\s+`\w+`', line):
+                columns[table].append(re.match(r'\s+`(\w+)`', line).group(1))
+            elif line.startswith(')'):
+                table = None
+            else:
+                insert = re.match(r'INSERT INTO `(\w+)` VALUES ', line)
+                if insert and insert.group(1) in TABLES:
+                    name = insert.group(1)
+                    positions = [columns[name].index(c) for c in TABLES[name]]
+                    rows = parse_sql_values(line[insert.end():])
+                    insert_rows(db, name, ([row[p] for p in positions] for row in rows))
+
+
+def import_csv_dir(directory, db):
+    for table, table_columns in TABLES.items():
+        with open(Path(directory) / f'{table}.csv', encoding='utf-8', newline='') as f:
+            insert_rows(db, table, ([row[c] for c in table_columns] for row in csv.DictReader(f)))
+
+
+def compile_table(db, pos):
+    """ Yield the (inflected form, lemma) pairs of a part of speech, for the forms that differ from their lemma. """
+
+    rows = db.execute(LEMMAS_QUERY, (f'%{pos}%',))
+    for form, entries in groupby(rows, key=lambda row: row[0]):
+        lemma = next(entries)[1]
+        if form and lemma and form != lemma:
+            yield form, lemma
+
+
+def known_lemmas(db, pos):
+    """ The lemmas of a part of speech, including the ones without other forms. """
+
+    return {lemma for lemma, in db.execute(LEXEMES_QUERY, (f'%{pos}%',)) if lemma}
+
+
+@plac.annotations(
+    source=("dexonline export: MySQL dump (.sql/.sql.gz), CSV directory or SQLite database", "positional", None, Path),
+    output=("Directory of the lookup tables", "option", "o", Path),
+    database=("SQLite database where a dump/CSV export is imported", "option", "d", Path),
+    prune=("Drop the forms whose lemma is predicted by the suffix rules", "flag", "p"),
+)
+def main(source, output=LOOKUPS_DIR, database=Path('dexonline.sqlite'), prune=False):
+    if source.is_dir() or source.suffix in ['.sql', '.gz']:
+        database.unlink() if database.exists() else None
+        db = sqlite3.connect(str(database))
+        create_tables(db)
+        if source.is_dir():
+            import_csv_dir(source, db)
+        else:
+            import_sql_dump(source, db)
+        db.commit()
+    else:
+        db = sqlite3.connect(str(source))
+
+    for index in INDEXES:
+        db.execute(index)
+
+    tables = {table: dict(compile_table(db, pos)) for table, pos in PARTS_OF_SPEECH.items()}
+    known = {table: known_lemmas(db, pos) for table, pos in PARTS_OF_SPEECH.items()}
+
+    # the proper nouns table is generated from the list of names (see prop-noun-lemma.py)
+    with open(output / 'prop-noun-lemmas.json', encoding='utf-8') as f:
+        tables["prop-noun-lemmas"] = json.load(f)
+    with open(NAMES_FILE, encoding='utf-8') as f:
+        known["prop-noun-lemmas"] = {line.strip().lower() for line in f if line.strip()}
+
+    lookups = Lookups()
+    rules = {}
+    for table, lemmas in tables.items():
+        rules[table] = SuffixLemmatizer.learn(lemmas.items(), known[table])
+        if prune:
+            lemmas = {form: lemma for form, lemma in lemmas.items() if rules[table].lemmatize(form) != lemma}
+
+        # the lemmas are looked up before the rules are applied, so the known lemmas rewritten by the rules or taken
+        # for a form of another lemma (e.g. the name "andrei" for the genitive of "andra") are kept as they are
+        known[table] |= set(lemmas.values())
+        identities = rules[table].rewritten(known[table], lemmas)
+        lemmas.update((lemma, lemma) for lemma in identities)
+
+        lookups.add_table(table, lemmas)
+        LemmaTrie.from_dict(lemmas).to_disk(output / f'{table}{TRIE_SUFFIX}')
+        print(f'{table}: {len(lemmas)} forms ({len(identities)} known lemmas kept as they are), '
+              f'{rules[table].size()} suffix rule nodes')
+
+    lookups.to_disk(output)
+    save_rules(rules, output / 'suffix-rules.json')
+    print("Saved the lookup tables to", output)
+
+    check_known_lemmas(output, known)
+
+
+def check_known_lemmas(output, known):
+    """ Check that the saved tables and rules (as loaded by the SyntacticParser) don't rewrite the known lemmas. """
+
+    rules = load_rules(output / 'suffix-rules.json')
+    for table, lemmas in known.items():
+        rewritten = rules[table].rewritten(lemmas, LemmaTrie.from_disk(output / f'{table}{TRIE_SUFFIX}'))
+        if rewritten:
+            raise SystemExit(f'{table}: the suffix rules rewrite {len(rewritten)} known lemmas, e.g. {rewritten[:10]}')
+
+
+if __name__ == "__main__":
+    plac.call(main)
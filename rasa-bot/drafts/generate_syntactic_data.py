@@ -0,0 +1,130 @@
+"""
+Generator of synthetic annotated examples for the syntactic parser.
+
+Sentence templates (with the heads and syntactic questions of their tokens, see sentence_templates.py) are filled
+with random words from the noun inventories (data/art_nouns.txt, data/nouns.txt) and the proper nouns list
+(data/subst-proprii). Several processes fill the templates in parallel, the duplicated sentences are dropped and the
+examples are streamed into dataset shards (see syntactic_dataset.py).
+
+Run from the rasa-bot folder:
+    python -m drafts.generate_syntactic_data -n 200000 -o drafts/data/syntactic/synthetic
+"""
+
+import os
+import random
+from codecs import open
+from hashlib import blake2b
+from multiprocessing import Pool
+from pathlib import Path
+
+import plac
+
+from syntactic_dataset import DATA_DIR, write_examples
+from sentence_templates import TEMPLATES, SLOT_VALUES, A_FI
+
+INVENTORY_DIR = Path(__file__).parent / 'data'
+
+inventory = None
+
+
+def genitive(name):
+    """ Genitive form of a feminine proper noun (same rules as prop-noun-lemma.py). """
+
+    if name == "Andreea":
+        return name[:-1] + "i"
+    if name[-2] in ['c', 'k', 'g']:
+        return name[:-1] + "ăi"
+    return name[:-1] + "ei"
+
+
+def load_inventory():
+    """ Load the single-word entries of the noun inventories. """
+
+    def read_lines(file):
+        with open(INVENTORY_DIR / file, 'r', encoding="utf-8") as f:
+            return [line.strip() for line in f]
+
+    # lines like "e cartea" or "sunt cărțile"
+    art_nouns = [line.split(' ', 1) for line in read_lines('art_nouns.txt') if ' ' in line]
+    proper_nouns = [name for name in read_lines('subst-proprii') if name.isalpha()]
+
+    return {
+        "ART": [(noun, number) for (number, noun) in art_nouns
+                if number in A_FI and noun.isalpha() and noun.islower()],
+        "NOUN": [noun for noun in read_lines('nouns.txt') if noun.isalpha() and noun.islower()],
+        "PROPN": proper_nouns,
+        "OWNER": [genitive(name) for name in proper_nouns if name.endswith("a")],
+    }
+
+
+def init_worker():
+    global inventory
+    inventory = load_inventory()
+
+
+def fill_template(template, rng):
+    text, heads, deps = template
+    number = "e"
+
+    words = []
+    for token in text.split(' '):
+        if token == "{ART}":
+            word, number = rng.choice(inventory["ART"])
+        elif token == "{A_FI}":
+            forms, weights = A_FI[number]
+            word = rng.choices(forms, weights=weights)[0]
+        elif token == "{NUM}":
+            word = str(rng.randint(2, 99))
+        elif token.startswith("{"):
+            slot = token[1:-1]
+            word = rng.choice(inventory[slot] if slot in inventory else SLOT_VALUES[slot])
+        else:
+            word = token
+        words.append(word)
+
+    return ' '.join(words).lower(), {"heads": list(heads), "deps": list(deps)}
+
+
+def generate_chunk(args):
+    """ Fill `size` random templates (run in a worker process). """
+
+    seed, size = args
+    rng = random.Random(seed)
+    return [fill_template(rng.choice(TEMPLATES), rng) for _ in range(size)]
+
+
+def generate(num_examples, workers=os.cpu_count(), chunk_size=5000, seed=0, max_attempts=10):
+    """ Yield up to `num_examples` distinct examples generated in parallel. """
+
+    seen = set()
+    num_chunks = max_attempts * (num_examples // chunk_size + 1)
+
+    with Pool(workers, initializer=init_worker) as pool:
+        chunks = pool.imap_unordered(generate_chunk, ((seed + i, chunk_size) for i in range(num_chunks)))
+        for chunk in chunks:
+            for text, annotations in chunk:
+                key = blake2b(text.encode("utf-8"), digest_size=8).digest()
+                if key in seen:
+                    continue
+
+                seen.add(key)
+                yield text, annotations
+                if len(seen) == num_examples:
+                    pool.terminate()
+                    return
+
+
+@plac.annotations(
+    num_examples=("Number of distinct examples to generate", "option", "n", int),
+    output=("Output dataset directory", "option", "o", Path),
+    workers=("Number of worker processes", "option", "w", int),
+    shard_size=("Number of examples of a shard", "option", "s", int),
+    seed=("Random seed", "option", "r", int),
+)
+def main(num_examples=100000, output=DATA_DIR / 'synthetic', workers=os.cpu_count(), shard_size=10000, seed=0):
+    count = write_examples(generate(num_examples, workers, seed=seed), output, shard_size)
+    print(f"Generated {count} examples in {output}")
+
+
+if __name__ == "__main__":
+    plac.call(main)
@@ -1,3 +1,4 @@
+import json
 from codecs import open
 from spacy.lemmatizer import Lemmatizer
 from spacy.lookups import Lookups, Table
@@ -6,11 +7,11 @@ from time import time
 
 def to_bin():
     with open(f'../data/lookups/noun-lemmas.json', 'r', encoding="utf-8") as f:
-        noun_lemmas = eval(f.read())
+        noun_lemmas = json.load(f)
     with open(f'../data/lookups/prop-noun-lemmas.json', 'r', encoding="utf-8") as f:
-        prop_noun_lemmas = eval(f.read())
+        prop_noun_lemmas = json.load(f)
     with open(f'../data/lookups/verb-lemmas.json', 'r', encoding="utf-8") as f:
-        verb_lemmas = eval(f.read())
+        verb_lemmas = json.load(f)
 
     lookups = Lookups()
     lookups.add_table("noun-lemmas", noun_lemmas)
@@ -0,0 +1,185 @@
+"""
+Accuracy metrics of the syntactic parser on annotated examples.
+
+The examples are parsed with `nlp.pipe` (optionally in several processes) and the predicted heads and syntactic
+questions are collected with `Doc.to_array`, so all the metrics are computed on NumPy arrays. The reports are
+written as JSON and SVG files, without any interactive plotting.
+"""
+
+import json
+from itertools import tee
+
+import numpy as np
+from spacy.attrs import HEAD, DEP
+
+from syntactic_dataset import dependency_types
+
+# predicted labels that are not syntactic questions
+UNKNOWN_LABEL = "?"
+
+
+class Evaluation:
+    """
+    Predicted and true (label index, absolute head) arrays of all the tokens of an evaluation set, with the indices
+    of the skipped sentences (whose tokenization doesn't match their annotations).
+    """
+
+    def __init__(self, labels, deps_true, deps_pred, heads_true, heads_pred, sentence_ids, skipped=()):
+        self.labels = labels
+        self.deps_true = deps_true
+        self.deps_pred = deps_pred
+        self.heads_true = heads_true
+        self.heads_pred = heads_pred
+        self.sentence_ids = sentence_ids
+        self.skipped = list(skipped)
+
+    @property
+    def num_sentences(self):
+        return len(np.unique(self.sentence_ids))
+
+    def label_accuracy(self):
+        return float(np.mean(self.deps_true == self.deps_pred)) if len(self.deps_true) else 0.0
+
+    def head_accuracy(self):
+        return float(np.mean(self.heads_true == self.heads_pred)) if len(self.heads_true) else 0.0
+
+    def head_accuracy_per_label(self):
+        """ Heads accuracy for the tokens of each true label (NaN for the labels without tokens). """
+
+        correct = np.bincount(self.deps_true, weights=self.heads_true == self.heads_pred, minlength=len(self.labels))
+        total = np.bincount(self.deps_true, minlength=len(self.labels))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return correct / total
+
+    def confusion_matrix(self):
+        """ Number of tokens for each (true label, predicted label) pair. """
+
+        n = len(self.labels)
+        return np.bincount(self.deps_true * n + self.deps_pred, minlength=n * n).reshape(n, n)
+
+    def precision_recall_f1(self):
+        conf_mat = self.confusion_matrix()
+        true_positives = np.diag(conf_mat)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            precision = np.nan_to_num(true_positives / conf_mat.sum(axis=0))
+            recall = np.nan_to_num(true_positives / conf_mat.sum(axis=1))
+            f1 = np.nan_to_num(2 * precision * recall / (precision + recall))
+
+        return precision, recall, f1, conf_mat.sum(axis=1)
+
+    def mismatched_sentences(self):
+        """ Indices of the sentences with at least one wrong label or head. """
+
+        wrong = (self.deps_true != self.deps_pred) | (self.heads_true != self.heads_pred)
+        return np.unique(self.sentence_ids[wrong])
+
+    def report(self):
+        precision, recall, f1, support = self.precision_recall_f1()
+        head_acc = self.head_accuracy_per_label()
+
+        return {
+            "sentences": self.num_sentences,
+            "skipped_sentences": self.skipped,
+            "tokens": len(self.deps_true),
+            "label_acc": self.label_accuracy(),
+            "head_acc": self.head_accuracy(),
+            "mismatched_sentences": self.mismatched_sentences().tolist(),
+            "labels": {
+                label: {
+                    "precision": float(precision[i]),
+                    "recall": float(recall[i]),
+                    "f1": float(f1[i]),
+                    "support": int(support[i]),
+                    "head_acc": None if np.isnan(head_acc[i]) else float(head_acc[i]),
+                }
+                for i, label in enumerate(self.labels)
+            },
+            "confusion_matrix": self.confusion_matrix().tolist(),
+        }
+
+
+def evaluate(nlp, examples, n_process=1, batch_size=256, labels=dependency_types):
+    """
+    Parse the (text, {"heads", "deps"}) examples and collect the predictions as NumPy arrays. The examples whose
+    number of tokens doesn't match their annotations are skipped (and counted in `Evaluation.skipped`).
+    """
+
+    labels = list(labels) + [UNKNOWN_LABEL]
+    label_index = {label: i for i, label in enumerate(labels)}
+
+    # map the hashes of the predicted labels to label indices with a binary search
+    label_hashes = np.array([nlp.vocab.strings.add(label) for label in labels], dtype=np.uint64)
+    order = np.argsort(label_hashes)
+    sorted_hashes = label_hashes[order]
+
+    texts, annotations = tee(examples)
+    docs = nlp.pipe((text for text, _ in texts), n_process=n_process, batch_size=batch_size)
+
+    deps_true, deps_pred, heads_true, heads_pred, sentence_ids, skipped = [], [], [], [], [], []
+    for i, (doc, (_, true)) in enumerate(zip(docs, annotations)):
+        if len(doc) != len(true['heads']) or len(doc) != len(true['deps']):
+            skipped.append(i)
+            continue
+
+        array = doc.to_array([HEAD, DEP])
+
+        # heads are stored as offsets relative to the tokens
+        heads_pred.append(array[:, 0].astype(np.int64) + np.arange(len(doc)))
+
+        positions = np.minimum(np.searchsorted(sorted_hashes, array[:, 1]), len(labels) - 1)
+        known = sorted_hashes[positions] == array[:, 1]
+        deps_pred.append(np.where(known, order[positions], label_index[UNKNOWN_LABEL]))
+
+        heads_true.append(np.asarray(true['heads'], dtype=np.int64))
+        deps_true.append(np.array([label_index.get(dep, label_index[UNKNOWN_LABEL]) for dep in true['deps']]))
+        sentence_ids.append(np.full(len(doc), i))
+
+    def concat(arrays):
+        return np.concatenate(arrays).astype(np.int64) if arrays else np.zeros(0, dtype=np.int64)
+
+    return Evaluation(labels, concat(deps_true), concat(deps_pred), concat(heads_true), concat(heads_pred),
+                      concat(sentence_ids), skipped)
+
+
+def score_model(nlp, examples):
+    """ Compute the syntactic questions (labels) and heads accuracy of the parser on annotated examples. """
+
+    evaluation = evaluate(nlp, examples)
+    label_acc = evaluation.label_accuracy()
+    head_acc = evaluation.head_accuracy()
+    return {"label_acc": label_acc, "head_acc": head_acc, "score": (label_acc + head_acc) / 2}
+
+
+def plot_confusion_matrix(evaluation, file):
+    """ Save the confusion matrix of the syntactic questions as an SVG file. """
+
+    # a standalone figure is rendered without pyplot, so no GUI backend is needed
+    from matplotlib.figure import Figure
+
+    conf_mat = evaluation.confusion_matrix()
+    labels = evaluation.labels
+    fig = Figure(figsize=(12, 10))
+    ax = fig.subplots()
+
+    ax.imshow(conf_mat, cmap='Greens')
+    for (i, j), count in np.ndenumerate(conf_mat):
+        if count:
+            ax.text(j, i, count, ha='center', va='center', fontsize=9,
+                    color='white' if count > conf_mat.max() / 2 else 'black')
+
+    ax.set_xticks(np.arange(len(labels)))
+    ax.set_yticks(np.arange(len(labels)))
+    ax.set_xticklabels(labels, rotation=90, fontsize=11)
+    ax.set_yticklabels(labels, fontsize=11)
+    ax.set_xlabel('Predicted', fontsize=13)
+    ax.set_ylabel('True', fontsize=13)
+    ax.set_title('Syntactic questions prediction', fontsize=13)
+    fig.savefig(file, format='svg', bbox_inches='tight')
+
+
+def write_reports(evaluation, json_file, svg_file=None):
+    with open(json_file, 'w', encoding='utf-8') as f:
+        json.dump(evaluation.report(), f, indent=2, ensure_ascii=False)
+
+    if svg_file:
+        plot_confusion_matrix(evaluation, svg_file)
@@ -0,0 +1,144 @@
+"""
+Prune the word vectors of a spaCy model to the words of our corpora.
+
+The words of the NLU data, of the syntactic training sentences and of the books corpus are counted and the vectors
+table is pruned to the `n` most frequent of them (`Vocab.prune_vectors` keeps the words with the highest `prob`, so
+the probabilities of the lexemes are set from the counts first). Every other word is remapped to its nearest kept
+vector, so it still gets a vector. The pruned model is saved with spaCy, whose vectors table is a raw NumPy array
+that the parser loads memory-mapped (see vectors.py).
+
+The intent classification accuracy (nearest centroid of the sentence vectors, trained on data/nlu.md and tested on
+data/nlu_test.md) and the parse accuracy (if the model has our parser) are reported before and after pruning.
+
+Run from the rasa-bot folder:
+    python -m drafts.prune_vectors spacy_ro -n 20000 -o ../models/spacy-ro-pruned
+    python -m drafts.prune_vectors ../models/spacy-syntactic -n 20000 -o ../models/spacy-syntactic-pruned
+"""
+
+import math
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import numpy as np
+import plac
+import spacy
+
+from drafts.parser_evaluation import score_model
+from drafts.train_syntactic_parser import read_unlabeled, strip_annotations
+from syntactic_dataset import TRAIN_PATH, TEST_PATH, dependency_types, read_examples
+from vectors import mmap_vectors
+
+NLU_DATA = './data/nlu.md'
+NLU_TEST_DATA = './data/nlu_test.md'
+CORPORA = [NLU_DATA, TRAIN_PATH, './drafts/data/carti']
+
+# probability of the words that don't occur in the corpora (below that of any counted word)
+UNSEEN_PROB = -100.0
+
+
+def word_counts(nlp, paths=CORPORA):
+    """ Count the words (tokens and their lowercase forms) of the corpora. """
+
+    counts = Counter()
+    for doc in nlp.tokenizer.pipe(read_unlabeled(paths)):
+        for token in doc:
+            counts[token.text] += 1
+            if token.lower_ != token.text:
+                counts[token.lower_] += 1
+
+    return counts
+
+
+def prune(nlp, n, counts):
+    """
+    Keep the vectors of the `n` most frequent words of the corpora and remap the other words to the nearest of them.
+
+    :return the {word: (kept word, similarity)} remapping
+    """
+
+    total = sum(counts.values())
+    for word in counts:
+        nlp.vocab[word]  # add the lexemes of the words absent from the vocab
+    for lex in nlp.vocab:
+        lex.prob = math.log(counts[lex.orth_] / total) if counts[lex.orth_] else UNSEEN_PROB
+
+    return nlp.vocab.prune_vectors(n)
+
+
+def read_intent_examples(file):
+    """ (text, intent) pairs of the NLU data (Markdown format), without entity annotations. """
+
+    intent = None
+    with open(file, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.startswith('## intent:'):
+                intent = line[len('## intent:'):].strip()
+            elif line.startswith('- ') and intent:
+                yield strip_annotations(line[2:].strip()), intent
+
+
+def intent_accuracy(nlp, train_file=NLU_DATA, test_file=NLU_TEST_DATA):
+    """ Accuracy of a nearest centroid intent classifier on the sentence vectors (mean of the word vectors). """
+
+    def sentence_vectors(examples):
+        texts, intents = zip(*examples)
+        vectors = np.array([doc.vector for doc in map(nlp.make_doc, texts)])
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms > 0, norms, 1), intents
+
+    train_vectors, train_intents = sentence_vectors(read_intent_examples(train_file))
+    by_intent = defaultdict(list)
+    for vector, intent in zip(train_vectors, train_intents):
+        by_intent[intent].append(vector)
+    labels = list(by_intent)
+    centroids = np.array([np.mean(by_intent[intent], axis=0) for intent in labels])
+
+    test_vectors, test_intents = sentence_vectors(read_intent_examples(test_file))
+    predicted = np.argmax(test_vectors @ centroids.T, axis=1)
+    return float(np.mean([labels[i] == intent for i, intent in zip(predicted, test_intents)]))
+
+
+def accuracy_report(nlp, test_path=TEST_PATH):
+    report = {"intent_acc": intent_accuracy(nlp)}
+    if nlp.has_pipe("parser") and set(dependency_types) <= set(nlp.get_pipe("parser").labels):
+        report.update(score_model(nlp, read_examples(test_path)))
+
+    return report
+
+
+@plac.annotations(
+    model=("Model to prune (name or path)", "positional", None, str),
+    n=("Number of vectors to keep", "option", "n", int),
+    output_dir=("Directory of the pruned model", "option", "o", Path),
+)
+def main(model, n=20000, output_dir=None):
+    nlp = spacy.load(model)
+    vectors = nlp.vocab.vectors
+    print(f'{model}: {vectors.n_keys} keys, {vectors.shape[0]} vectors ({vectors.data.nbytes / 2 ** 20:.1f} MB)')
+    before = accuracy_report(nlp)
+
+    counts = word_counts(nlp)
+    remap = prune(nlp, n, counts)
+    after = accuracy_report(nlp)
+
+    vectors = nlp.vocab.vectors
+    print(f'pruned: {vectors.n_keys} keys, {vectors.shape[0]} vectors ({vectors.data.nbytes / 2 ** 20:.1f} MB), '
+          f'{len(remap)} words remapped')
+    print(f'corpora: {len(counts)} words, {sum(1 for word in counts if word in remap)} of them remapped')
+    for name in before:
+        print(f'{name}: before {before[name]:.4f}, after {after[name]:.4f}')
+
+    if output_dir is not None:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        nlp.meta["name"] = nlp.meta.get("name", "model") + "_pruned"
+        nlp.meta["accuracy"] = dict(nlp.meta.get("accuracy", {}), **after)
+        nlp.to_disk(output_dir)
+
+        # load the saved table the way the runtime does
+        saved = mmap_vectors(spacy.load(output_dir), output_dir).vocab.vectors
+        print(f'Saved model to {output_dir} ({saved.shape[0]} vectors, '
+              f'memory-mapped: {isinstance(saved.data, np.memmap)})')
+
+
+if __name__ == "__main__":
+    plac.call(main)
@@ -0,0 +1,107 @@
+"""
+Hyperparameter sweep with k-fold cross-validation for the syntactic parser.
+
+Every (hyperparameters, fold) trial trains the parser in its own process with early stopping on the fold's dev
+set. The configurations are ranked by their mean dev score over the folds (leaderboard.json) and the best one is
+retrained on the whole training set and stored as <output>/model-best.
+
+Run from the rasa-bot folder:
+    python -m drafts.sweep_syntactic_parser -k 5 -n 20,40 -d 0.0,0.2 -b 4:32:1.001,1:16:1.01 -o ../models/sweep
+"""
+
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import plac
+
+from syntactic_dataset import TRAIN_PATH, read_examples, write_examples
+from drafts.train_syntactic_parser import train, store_model
+
+
+def write_folds(train_path, folds_dir, k):
+    """ Split the training set into k (train, dev) folds stored as datasets. """
+
+    folds = []
+    for fold in range(k):
+        fold_dir = folds_dir / f'fold-{fold}'
+        write_examples((ex for i, ex in enumerate(read_examples(train_path)) if i % k != fold), fold_dir / 'train')
+        write_examples((ex for i, ex in enumerate(read_examples(train_path)) if i % k == fold), fold_dir / 'dev')
+        folds.append((fold_dir / 'train', fold_dir / 'dev'))
+
+    return folds
+
+
+def run_trial(base_model, config, fold_paths, patience):
+    """ Train the parser on a fold and return its best dev scores. """
+
+    train_path, dev_path = fold_paths
+    nlp = train(base_model, n_iter=config["n_iter"], train_path=train_path, dropout=config["dropout"],
+                batch_size=config["batch_size"], dev_path=dev_path, patience=patience)
+
+    return nlp.meta["accuracy"]
+
+
+def parse_list(value, cast):
+    return [cast(item) for item in value.split(',')]
+
+
+def parse_batch_sizes(value):
+    return [tuple(float(v) for v in schedule.split(':')) for schedule in value.split(',')]
+
+
+@plac.annotations(
+    output=("Directory where the leaderboard and the best model are stored", "option", "o", Path),
+    model=("Base spaCy model", "option", "m", str),
+    k=("Number of cross-validation folds", "option", "k", int),
+    n_iter=("Comma separated maximum numbers of iterations", "option", "n", str),
+    dropout=("Comma separated dropout rates", "option", "d", str),
+    batch_size=("Comma separated batch size schedules (start:stop:compound)", "option", "b", str),
+    patience=("Iterations without dev improvement before stopping", "option", "p", int),
+    workers=("Number of parallel training processes", "option", "w", int),
+)
+def main(output=Path('../models/sweep'), model="spacy_ro", k=5, n_iter="40", dropout="0.0,0.2",
+         batch_size="4:32:1.001", patience=5, workers=os.cpu_count()):
+    output.mkdir(parents=True, exist_ok=True)
+    folds = write_folds(TRAIN_PATH, output / 'folds', k)
+
+    configs = [{"n_iter": n, "dropout": d, "batch_size": b}
+               for n, d, b in itertools.product(parse_list(n_iter, int), parse_list(dropout, float),
+                                                parse_batch_sizes(batch_size))]
+
+    scores = {i: [] for i in range(len(configs))}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        trials = {executor.submit(run_trial, model, config, fold, patience): i
+                  for (i, config), fold in itertools.product(enumerate(configs), folds)}
+
+        for trial in as_completed(trials):
+            scores[trials[trial]].append(trial.result())
+            print(f'Trial done: {configs[trials[trial]]} -> {trial.result()}')
+
+    leaderboard = []
+    for i, config in enumerate(configs):
+        leaderboard.append(dict(config, **{
+            metric: sum(s[metric] for s in scores[i]) / len(scores[i])
+            for metric in ["score", "label_acc", "head_acc", "iteration"]
+        }))
+    leaderboard.sort(key=lambda entry: entry["score"], reverse=True)
+
+    with open(output / 'leaderboard.json', 'w', encoding='utf-8') as f:
+        json.dump(leaderboard, f, indent=2)
+
+    print('\nLeaderboard:')
+    for entry in leaderboard:
+        print(f'{entry["score"]:.4f} (labels {entry["label_acc"]:.4f}, heads {entry["head_acc"]:.4f}) '
+              f'n_iter={entry["n_iter"]} dropout={entry["dropout"]} batch_size={entry["batch_size"]}')
+
+    # retrain the best configuration on all the training data, for the mean best number of iterations of the folds
+    best = leaderboard[0]
+    nlp = train(model, n_iter=round(best["iteration"]) + 1, dropout=best["dropout"], batch_size=best["batch_size"])
+    nlp.meta["accuracy"] = {metric: best[metric] for metric in ["score", "label_acc", "head_acc"]}
+    store_model(nlp, output / 'model-best')
+
+
+if __name__ == "__main__":
+    plac.call(main)
@@ -1,20 +0,0 @@
-dependency_types = [
-    "-",
-    "prep",
-    "ROOT",
-    "cine",
-    "care",
-    "ce fel de",
-    "ce",
-    "pe cine",
-    "unde",
-    "când",
-    "cât timp",
-    "la cât timp",
-    "cât de des",
-    "cum este",
-    "care este",
-    "al cui",
-    "cât",
-    "cui",
-]
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""
+Interning of the class nodes: a bounded map of the (lemma, pre) of the most recently written classes to the ids of
+their nodes, so the writes bind the frequent classes ("eu", "cheie", "sertar") by id instead of merging them by
+their properties on the server.
+
+The ids come from the results of the writes that merged the classes. A node bound by id is also checked against its
+properties, so an id reused by Neo4j after the class node was deleted never binds another node: the write then
+matches nothing, the ids it used are invalidated and it is run again with merges.
+"""
+
+from collections import OrderedDict
+
+from metrics import CLASS_CACHE_LOOKUPS
+
+
+class ClassCache:
+    """ LRU map of (lemma, pre) -> id of the class node. """
+
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self.ids = OrderedDict()
+
+    def get(self, key):
+        node_id = self.ids.get(key)
+        if node_id is None:
+            CLASS_CACHE_LOOKUPS.inc("miss")
+            return None
+
+        CLASS_CACHE_LOOKUPS.inc("hit")
+        self.ids.move_to_end(key)
+        return node_id
+
+    def put(self, key, node_id):
+        self.ids[key] = node_id
+        self.ids.move_to_end(key)
+        if len(self.ids) > self.max_size:
+            self.ids.popitem(last=False)
+
+    def invalidate(self, key):
+        self.ids.pop(key, None)
+
+    def clear(self):
+        self.ids.clear()
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class InternedClasses:
+    """ Class nodes of a write query: the ones bound by their cached ids and the ones merged by their properties. """
+
+    def __init__(self, cache=None, bind_ids=True):
+        self.cache = cache
+        self.bind_ids = bind_ids  # bind the cached ids (otherwise only fill the cache from the merges)
+        self.bound = []  # (variable, key, node id)
+        self.merged = []  # (variable, key)
+
+    def bind(self, variable, key):
+        """ Bind the class node to its cached id, if any; return whether it is bound (otherwise it is merged). """
+
+        node_id = self.cache.get(key) if self.cache is not None and self.bind_ids else None
+        if node_id is None:
+            self.merged.append((variable, key))
+            return False
+
+        self.bound.append((variable, key, node_id))
+        return True
+
+    def match_clause(self):
+        """ Clause that binds the interned nodes, placed before the write query. """
+
+        if not self.bound:
+            return ''
+
+        nodes = ', '.join(f'({variable}:class)' for variable, _, _ in self.bound)
+        conditions = ' and '.join(f'id({variable}) = {node_id} and {variable}.value = "{key[0]}" and '
+                                  f'{variable}.pre = "{key[1]}"' for variable, key, node_id in self.bound)
+        return f' match {nodes} where {conditions}'
+
+    def return_clause(self):
+        """ Clause that returns a row for a successful write, with the ids of the merged class nodes. """
+
+        return ' return 1 as written' + ''.join(f', id({variable}) as {variable}' for variable, _ in self.merged)
+
+    def update(self, record):
+        """ Intern the ids of the merged classes of a successful write. """
+
+        if self.cache is not None:
+            for variable, key in self.merged:
+                self.cache.put(key, record[variable])
+
+    def kind(self):
+        """ Whether the class nodes of the write were all interned, all merged or mixed. """
+
+        if not self.bound:
+            return "merged"
+        return "mixed" if self.merged else "interned"
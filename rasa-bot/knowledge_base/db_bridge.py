@@ -1,11 +1,32 @@
+import atexit
+import time
+
 from neo4j import GraphDatabase
+from .class_cache import ClassCache, InternedClasses
+from .fuzzy_index import TrigramIndex, entity_values, request_value
+from .graph_io import write_records, read_records, check_name, batches
 from .types import InfoType
+from .vector_index import VectorIndex
+from metrics import DB_QUERY_LATENCY, DB_QUERY_ERRORS, FUZZY_RESOLUTIONS, KB_WRITE_LATENCY
 
 # Neo4j database connection strings
 NEO4J_URI = "bolt://localhost:7687"
 USERNAME = "neo4j"
 PASSWORD = "pass"
 
+# lemmas of the personal pronouns (e.g. owners like "meu", "lui"), poor anchors for matching a noun phrase
+PRONOUN_LEMMAS = {"eu", "tu", "el", "ea", "noi", "voi", "ei", "ele"}
+
+
+def prettify_result(values):
+    """ Format the answer for a list of [requested value, entity values...] results. """
+
+    if not values:
+        return "Nu știu"
+    if len(values) == 1:
+        return values[0][0]
+    return '\n'.join([f"▪ {', '.join(val[1:])}: ➜ {val[0]}" for val in values])
+
 
 class QueryBuilder:
     id = 0
@@ -15,8 +36,32 @@ class QueryBuilder:
         QueryBuilder.id = 0
 
     @staticmethod
-    def query_create_noun_phrase(entity, match_existing=False):
-        """ Build a Neo4j query that inserts a new entity into the database. """
+    def sender_props(sender):
+        """
+        Properties of the relations created for a sender (the relations of its partition of the graph); the sender id
+        comes from the clients, so it is passed as the `$sender` parameter of the query.
+        """
+
+        return ' {sender: $sender}' if sender else ''
+
+    @staticmethod
+    def query_class_node(action, node_id, entity, interned=None):
+        """ Clause that merges or creates a class node (none for a merged class bound by its interned id). """
+
+        key = (entity["lemma"], entity.get("pre", ""))
+        if action == "merge" and interned is not None and interned.bind(node_id, key):
+            return ''
+
+        return f' {action} ({node_id}:class {{value: "{key[0]}", pre: "{key[1]}"}})'
+
+    @staticmethod
+    def query_create_noun_phrase(entity, match_existing=False, sender=None, interned=None):
+        """
+        Build a Neo4j query that inserts a new entity into the database.
+
+        The merged class nodes whose ids are interned (see class_cache.py) are bound by the `interned.match_clause()`
+        that precedes the query.
+        """
 
         action = "merge" if match_existing else "create"
 
@@ -26,25 +71,25 @@ class QueryBuilder:
 
         if not entity['specifiers']:
             # single node noun phrase
-            query = f' {action} ({eid}:class {{value: "{entity["lemma"]}", pre: "{entity.get("pre", "")}"}})'
+            query = QueryBuilder.query_class_node(action, eid, entity, interned)
         else:
             # instance node along with some specifiers
             QueryBuilder.id += 1
             cls_id = f'n{QueryBuilder.id}'
 
-            query = f' {action} ({cls_id}:class {{value: "{entity["lemma"]}", pre: "{entity.get("pre", "")}"}})' \
-                    f' create ({eid}:instance)-[:IS_A]->({cls_id})'
+            query = QueryBuilder.query_class_node(action, cls_id, entity, interned) + \
+                f' create ({eid}:instance)-[:IS_A{QueryBuilder.sender_props(sender)}]->({cls_id})'
 
             for spec in entity['specifiers']:
                 inner_query, inner_id, inner_str = \
-                    QueryBuilder.query_create_noun_phrase(spec, True)
+                    QueryBuilder.query_create_noun_phrase(spec, True, sender, interned)
                 query += inner_query
 
                 # link the nodes
                 if spec['question'] in ['care', 'ce fel de']:
-                    query += f' create ({eid})-[:SPEC]->({inner_id})'
+                    query += f' create ({eid})-[:SPEC{QueryBuilder.sender_props(sender)}]->({inner_id})'
                 elif spec['question'] == 'al cui':
-                    query += f' create ({inner_id})-[:HAS]->({eid})'
+                    query += f' create ({inner_id})-[:HAS{QueryBuilder.sender_props(sender)}]->({eid})'
 
                 string += " " + inner_str
 
@@ -54,95 +99,288 @@ class QueryBuilder:
 
     @staticmethod
     def query_match_noun_phrase(entity):
-        """ Build a Neo4j query that tries to match (find) an entity in the database. """
+        """
+        Build a Neo4j query that tries to match (find) an entity in the database.
+
+        The entity and its nested specifiers are compiled into connected patterns, written outward from the most
+        selective class node (see `anchor`), with the class properties checked in the WHERE clause, so the planner
+        expands the relations of the matched nodes instead of joining independent matches. The specifiers without a
+        linking relation (e.g. the answers of the 'cât' questions) are not connected to the entity, so each of them
+        gets a separate match clause, like in an uncompiled query.
+        """
+
+        nodes, edges = [], []
+        eid = QueryBuilder.__entity_tree(entity, 0, nodes, edges)
+
+        query, remaining = '', nodes
+        while remaining:
+            # a breadth-first walk from the anchor reaches the relations of its connected part of the entity tree
+            anchor = QueryBuilder.anchor(remaining)
+            patterns, visited, queue = [], {anchor}, [anchor]
+            for node in queue:
+                for source, rel, target in edges:
+                    other = target if node == source else source if node == target else None
+                    if other is None or other in visited:
+                        continue
+
+                    if node == source:
+                        patterns.append(f'({QueryBuilder.__label(node)})-[{rel}]->({QueryBuilder.__label(other)})')
+                    else:
+                        patterns.append(f'({QueryBuilder.__label(node)})<-[{rel}]-({QueryBuilder.__label(other)})')
+                    visited.add(other)
+                    queue.append(other)
+
+            conditions = [f'{cls}.value = "{lemma}" and {cls}.pre = "{pre}"'
+                          for cls, lemma, pre, _ in remaining if cls in visited]
+            query += f' match {", ".join(patterns)} where {" and ".join(conditions)}'
+            remaining = [node for node in remaining if node[0] not in visited]
+
+        return query, eid
+
+    @staticmethod
+    def __entity_tree(entity, depth, nodes, edges):
+        """ Collect the class nodes and the relations of an entity and its specifiers; return the entity node id. """
 
         QueryBuilder.id += 1
-        eid = f'n{QueryBuilder.id}'
+        eid, cls_id = f'n{QueryBuilder.id}', f'c{QueryBuilder.id}'
 
-        # match the entity as a simple node or as an instance node
-        query = f' match ({eid})-[:IS_A*0..1]->({{value: "{entity["lemma"]}", pre: "{entity.get("pre", "")}"}})'
+        # the entity is a simple (class) node or an instance node of the class
+        nodes.append((cls_id, entity["lemma"], entity.get("pre", ""), depth))
+        edges.append((eid, ':IS_A*0..1', cls_id))
 
         for spec in entity['specifiers']:
-            inner_query, inner_id = QueryBuilder.query_match_noun_phrase(spec)
-            query += inner_query
+            inner_id = QueryBuilder.__entity_tree(spec, depth + 1, nodes, edges)
 
             # link the specifier nodes
             if spec['question'] in ['care', 'ce fel de']:
-                query += f' match ({eid})-[:SPEC]->({inner_id})'
+                edges.append((eid, ':SPEC', inner_id))
             elif spec['question'] == 'al cui':
-                query += f' match ({inner_id})-[:HAS]->({eid})'
+                edges.append((inner_id, ':HAS', eid))
 
-        return query, eid
+        return eid
+
+    @staticmethod
+    def __label(node_id):
+        return f'{node_id}:class' if node_id.startswith('c') else node_id
+
+    @staticmethod
+    def anchor(nodes):
+        """
+        Choose the class node the match starts from: the most deeply nested specifier that is not a personal pronoun
+        (the owners and qualifiers narrow the phrase the most, while "eu"/"el"/... are shared by most entities).
+        """
+
+        candidates = [node for node in nodes if node[1] not in PRONOUN_LEMMAS] or nodes
+        return max(candidates, key=lambda node: node[3])[0]
 
 
 class DbBridge:
-    def __init__(self):
+    def __init__(self, embedder=None):
         # create database connection and session
         self.driver = GraphDatabase.driver(NEO4J_URI, auth=(USERNAME, PASSWORD), encrypted=False)
         self.session = self.driver.session()
 
+        # the noun phrase matches start from a class node looked up by its value
+        self.session.run('create index on :class(value)').consume()
+
+        # ids of the class nodes of the recent writes
+        self.class_cache = ClassCache()
+
+        # values of the stored entities, for resolving the requests without an exact match (by their trigrams and,
+        # given an embedder (see vector_index.py), by their word vectors); the values are read from the database on
+        # the first such request, so the startup time doesn't grow with the graph
+        self.fuzzy_index = TrigramIndex()
+        self.entity_indexes_loaded = False
+        self.embedder = embedder
+        self.vector_index = None
+        if embedder:
+            self.vector_index = VectorIndex.from_disk() or VectorIndex(embedder.dim)
+            atexit.register(self.vector_index.to_disk)
+
     def __del__(self):
         self.driver.close()
 
-    def set_value(self, entity, value, type=InfoType.VAL):
-        """ Store a detail of an entity in the database. """
+    def __run(self, query, shape, parameters=None):
+        """
+        Run a query and fetch all its records, recording the round trip latency under the given query shape
+        (the operation and the type of information it targets).
+        """
+
+        start = time.perf_counter()
+        try:
+            return list(self.session.run(query, parameters))
+        except Exception:
+            DB_QUERY_ERRORS.inc(shape)
+            raise
+        finally:
+            DB_QUERY_LATENCY.observe(shape, time.perf_counter() - start)
+
+    def __load_entity_indexes(self):
+        self.entity_indexes_loaded = True
+        for record in self.__run('match (n:class) return n.value as value, n.pre as pre', 'load_entity_indexes'):
+            self.__index_value(record['value'], ("class", record['value'], record['pre']))
+        for record in self.__run('match (n:instance) return n.value as value', 'load_entity_indexes'):
+            self.__index_value(record['value'], ("instance", record['value']))
+
+    def __index_value(self, value, node):
+        self.fuzzy_index.add(value, node)
+        # the values are only embedded once, since the vector index is saved
+        if self.vector_index is not None and (value, node) not in self.vector_index.keys:
+            self.vector_index.add(value, node, self.embedder(value))
+
+    def __index_entities(self, *entities):
+        if not self.entity_indexes_loaded:
+            return  # indexed when the values are loaded
+
+        for entity in entities:
+            for value, node in entity_values(entity):
+                self.__index_value(value, node)
+
+    def __write(self, build_query, shape, parameters=None):
+        """
+        Run a write query built by `build_query(interned)`, binding the interned class nodes by id. If an interned
+        node no longer exists, its id is invalidated and the query is run again with all the classes merged.
+        """
+
+        for bind_ids in [True, False]:
+            interned = InternedClasses(self.class_cache, bind_ids)
+            query = build_query(interned)
+            query = interned.match_clause() + query + interned.return_clause()
+
+            print(query)
+            start = time.perf_counter()
+            result = self.__run(query, shape, parameters)
+            if result or not interned.bound:
+                break
+
+            for _, key, _ in interned.bound:
+                self.class_cache.invalidate(key)
+
+        KB_WRITE_LATENCY.observe(interned.kind(), time.perf_counter() - start)
+        if result:
+            interned.update(result[0])
+
+    def invalidate_class_cache(self):
+        """ Forget the interned class ids (e.g. after deleting class nodes outside this bridge). """
+
+        self.class_cache.clear()
+
+    def set_value(self, entity, value, type=InfoType.VAL, sender=None):
+        """ Store a detail of an entity in the database (in the partition of the sender, if given). """
+
+        self.__write(lambda interned: self.__query_set_value(entity, value, type, sender, interned),
+                     f'set_value:{type.value}', {"sender": sender})
+        self.__index_entities(entity, *([value] if type == InfoType.LOC else []))
 
-        query, node_id, _ = QueryBuilder.query_create_noun_phrase(entity, match_existing=True)
+    @staticmethod
+    def __query_set_value(entity, value, type, sender, interned):
+        query, node_id, _ = QueryBuilder.query_create_noun_phrase(entity, match_existing=True, sender=sender,
+                                                                  interned=interned)
+        props = QueryBuilder.sender_props(sender)
 
         if type == InfoType.VAL:
-            query += f' create ({node_id})-[:{type.value}]->(:val {{value: "{value}"}})'
+            query += f' create ({node_id})-[:{type.value}{props}]->(:val {{value: "{value}"}})'
         elif type == InfoType.LOC:
-            query_create_location, location_node_id, _ = QueryBuilder.query_create_noun_phrase(value)
+            query_create_location, location_node_id, _ = QueryBuilder.query_create_noun_phrase(value, sender=sender,
+                                                                                                interned=interned)
             query += query_create_location
-            query += f' create ({node_id})-[:{type.value}]->({location_node_id})'
+            query += f' create ({node_id})-[:{type.value}{props}]->({location_node_id})'
         elif type in [InfoType.TIME_POINT, InfoType.TIME_START, InfoType.TIME_END,
                       InfoType.TIME_RANGE, InfoType.TIME_DURATION]:
-            query += f' create ({node_id})-[:{type.value}]->(:time {{value: "{value}"}})'
+            query += f' create ({node_id})-[:{type.value}{props}]->(:time {{value: "{value}"}})'
 
-        print(query)
-        self.session.run(query)
+        return query
 
-    def get_value(self, entity, type=InfoType.VAL):
+    def get_value(self, entity, type=InfoType.VAL, sender=None):
         """ Get a detail of an entity from the database. """
 
         query, node_id = QueryBuilder.query_match_noun_phrase(entity)
         query += f' match ({node_id})-[:{type.value}]->(val) return val, {node_id} as entity'
 
         print(query)
-        result = self.session.run(query)
+        result = self.__run(query, f'get_value:{type.value}')
         values = [[record['val']['value'], record['entity']['value']] for record in result]
+        if not values:
+            values = self.__get_similar_value(entity, type)
+
+        return prettify_result(values)
+
+    def similar_entities(self, entity):
+        """ Candidate stored entities for a request, by index: [("trigram", candidates), ("vector", candidates)]. """
+
+        if not self.entity_indexes_loaded:
+            self.__load_entity_indexes()
+
+        value = request_value(entity)
+        tiers = [("trigram", self.fuzzy_index.search(value))]
+        if self.vector_index is not None:
+            tiers.append(("vector", self.vector_index.search(self.embedder(value))))
+
+        return tiers
+
+    def __get_similar_value(self, entity, type):
+        """ Get the detail of the most similar stored entity that has it (see fuzzy_index.py and vector_index.py). """
+
+        exact = entity_values(entity)[-1][1]
+        tried = {exact}
+        for tier, candidates in self.similar_entities(entity):
+            for node, _ in candidates:
+                if node in tried:
+                    continue
+                tried.add(node)
 
-        return self.__prettyfy_result(values)
+                if node[0] == "class":
+                    query = f' match (n)-[:IS_A*0..1]->(c:class) where c.value = "{node[1]}" and c.pre = "{node[2]}"'
+                else:
+                    query = f' match (n:instance) where n.value = "{node[1]}"'
+                query += f' match (n)-[:{type.value}]->(val) return val, n as entity'
 
-    def store_action(self, components):
+                result = self.__run(query, f'get_similar_value:{type.value}')
+                if result:
+                    FUZZY_RESOLUTIONS.inc(tier)
+                    return [[record['val']['value'], record['entity']['value']] for record in result]
+
+        FUZZY_RESOLUTIONS.inc("unresolved")
+        return []
+
+    def store_action(self, components, sender=None):
         """
         Store a complete action of a subject, eventually together with other semantic entities
         (like location, timestamp, direct object, etc.).
         """
 
-        query, subj_node_id, _ = QueryBuilder.query_create_noun_phrase(components['subj'], match_existing=True)
+        self.__write(lambda interned: self.__query_store_action(components, sender, interned), 'store_action',
+                     {"sender": sender})
+        self.__index_entities(*filter(None, [components['subj'], components['ce']] + components['loc']))
 
-        query += f' create ({subj_node_id})-[:ACTION]->(act:action {{value: "{components["action"]}"}})'
+    @staticmethod
+    def __query_store_action(components, sender, interned):
+        query, subj_node_id, _ = QueryBuilder.query_create_noun_phrase(components['subj'], match_existing=True,
+                                                                       sender=sender, interned=interned)
+        props = QueryBuilder.sender_props(sender)
+
+        query += f' create ({subj_node_id})-[:ACTION{props}]->(act:action {{value: "{components["action"]}"}})'
 
         if components['ce']:
-            sub_query, node_id, _ = QueryBuilder.query_create_noun_phrase(components['ce'])
+            sub_query, node_id, _ = QueryBuilder.query_create_noun_phrase(components['ce'], sender=sender,
+                                                                          interned=interned)
             query += sub_query
-            query += f' create (act)-[:CE]->({node_id})'
+            query += f' create (act)-[:CE{props}]->({node_id})'
 
         if components['loc']:
             for loc in components['loc']:
-                query_create_location, location_node_id, _ = QueryBuilder.query_create_noun_phrase(loc)
+                query_create_location, location_node_id, _ = QueryBuilder.query_create_noun_phrase(
+                    loc, sender=sender, interned=interned)
                 query += query_create_location
-                query += f' create (act)-[:LOC]->({location_node_id})'
+                query += f' create (act)-[:LOC{props}]->({location_node_id})'
 
         if components['time']:
-            for i, time in enumerate(components['time']):
-                query += f' create (act)-[:{time[1].value}]->(t{i}:time {{value: "{time[0]}"}})'
+            for i, timestamp in enumerate(components['time']):
+                query += f' create (act)-[:{timestamp[1].value}{props}]->(t{i}:time {{value: "{timestamp[0]}"}})'
 
-        print(query)
-        self.session.run(query)
+        return query
 
-    def get_action_time(self, components, info_type=InfoType.TIME_POINT):
+    def get_action_time(self, components, info_type=InfoType.TIME_POINT, sender=None):
         """
         Get timestamp of an action expressed through a complex sentence
         (containing more than the entity whose time is requested).
@@ -169,23 +407,120 @@ class DbBridge:
                 noun_phrase_nodes.append(location_node_id)
 
         if components['time']:
-            for i, time in enumerate(components['time']):
-                query += f' match (act)-[:{time[1].value}]->(t {{value: "{time[0]}"}})'
+            for i, timestamp in enumerate(components['time']):
+                query += f' match (act)-[:{timestamp[1].value}]->(t {{value: "{timestamp[0]}"}})'
 
         # extract the requested property of the action
         query += f' match (act)-[:{info_type.value}]->(time) return time'
         if noun_phrase_nodes:
             query += ', ' + ', '.join(noun_phrase_nodes)
         print(query)
-        result = self.session.run(query)
+        result = self.__run(query, f'get_action_time:{info_type.value}')
         values = [[record['time']['value']] + [record[np]['value'] for np in noun_phrase_nodes] for record in result]
 
-        return self.__prettyfy_result(values)
+        return prettify_result(values)
 
-    @staticmethod
-    def __prettyfy_result(values):
-        if not values:
-            return "Nu știu"
-        if len(values) == 1:
-            return values[0][0]
-        return '\n'.join([f"▪ {', '.join(val[1:])}: ➜ {val[0]}" for val in values])
+    def export_records(self, sender=None, page_size=5000):
+        """
+        Read the nodes and then the relations of the graph (or of the partition of a sender) as JSONL records.
+
+        The elements are read in pages of consecutive ids, each looked up directly by id, so the memory and the cost
+        of a page don't depend on the size of the graph.
+        """
+
+        partition = ' and (n)-[{sender: $sender}]-()' if sender else ''
+        yield from self.__read_pages(
+            'match (n) return max(id(n)) as max_id',
+            f'unwind range($first, $last) as i match (n) where id(n) = i{partition} '
+            f'return id(n) as id, labels(n) as labels, properties(n) as properties',
+            lambda r: {"node": r['id'], "labels": r['labels'], "properties": r['properties']},
+            sender, page_size)
+
+        partition = ' and r.sender = $sender' if sender else ''
+        yield from self.__read_pages(
+            'match ()-[r]->() return max(id(r)) as max_id',
+            f'unwind range($first, $last) as i match ()-[r]->() where id(r) = i{partition} '
+            f'return type(r) as type, id(startNode(r)) as start, id(endNode(r)) as end, properties(r) as properties',
+            lambda r: {"rel": r['type'], "start": r['start'], "end": r['end'], "properties": r['properties']},
+            sender, page_size)
+
+    def __read_pages(self, max_id_query, page_query, to_record, sender, page_size):
+        max_id = self.__run(max_id_query, 'export')[0]['max_id']
+        for first in range(0, (max_id if max_id is not None else -1) + 1, page_size):
+            parameters = {"first": first, "last": first + page_size - 1, "sender": sender}
+            for record in self.__run(page_query, 'export', parameters):
+                yield to_record(record)
+
+    def partition_records(self, sender):
+        """ The relations of the partition of a sender, each preceded by its end nodes not read before. """
+
+        seen = set()
+        query = 'match (a)-[r]->(b) where r.sender = $sender return id(a) as a, labels(a) as a_labels, ' \
+                'properties(a) as a_properties, type(r) as type, properties(r) as properties, id(b) as b, ' \
+                'labels(b) as b_labels, properties(b) as b_properties'
+        for record in self.__run(query, 'load_partition', {"sender": sender}):
+            for node in ['a', 'b']:
+                if record[node] not in seen:
+                    seen.add(record[node])
+                    yield {"node": record[node], "labels": record[node + '_labels'],
+                           "properties": record[node + '_properties']}
+            yield {"rel": record['type'], "start": record['a'], "end": record['b'], "properties": record['properties']}
+
+    def shared_classes(self, sender):
+        """
+        The (value, pre) of the classes of the partition of a sender whose nodes or instances also have relations
+        outside the partition (stored by other senders or without a sender).
+        """
+
+        query = 'match (c:class)-[{sender: $sender}]-() with distinct c ' \
+                'match (c)<-[:IS_A*0..1]-(n)-[r]->() where r.sender is null or r.sender <> $sender ' \
+                'return distinct c.value as value, c.pre as pre'
+        return {(record['value'], record['pre']) for record in self.__run(query, 'load_partition', {"sender": sender})}
+
+    def export_graph(self, file, sender=None, page_size=5000):
+        """ Stream the graph (or the partition of a sender) to a JSONL file; return the number of records. """
+
+        return write_records(self.export_records(sender, page_size), file)
+
+    def import_records(self, records, batch_size=5000):
+        """
+        Load node and relation records with batched, parameterized writes (one query per batch and label set or
+        relation type). The class nodes are merged with the existing ones; the ids of the file are mapped to the ids
+        of the created nodes, so only this mapping grows with the size of the import.
+        """
+
+        ids, count = {}, 0
+        for batch in batches(records, batch_size):
+            groups = {}
+            for record in batch:
+                if "node" in record:
+                    key = ("node", tuple(check_name(label) for label in record["labels"]))
+                else:
+                    key = ("rel", check_name(record["rel"]))
+                groups.setdefault(key, []).append(record)
+
+            for (kind, name), rows in groups.items():
+                if kind == "node":
+                    if name == ("class",):
+                        query = 'unwind $rows as row ' \
+                                'merge (n:class {value: row.properties.value, pre: row.properties.pre}) ' \
+                                'set n += row.properties'
+                    else:
+                        query = f'unwind $rows as row create (n{"".join(":" + label for label in name)}) ' \
+                                f'set n = row.properties'
+                    result = self.__run(query + ' return row.node as old, id(n) as new', 'import', {"rows": rows})
+                    ids.update((record['old'], record['new']) for record in result)
+                else:
+                    rows = [dict(row, start=ids[row["start"]], end=ids[row["end"]]) for row in rows]
+                    self.__run(f'unwind $rows as row match (a), (b) where id(a) = row.start and id(b) = row.end '
+                               f'create (a)-[r:{name}]->(b) set r = row.properties', 'import', {"rows": rows})
+            count += len(batch)
+
+        if self.entity_indexes_loaded:
+            self.__load_entity_indexes()
+        return count
+
+    def import_graph(self, file, batch_size=5000):
+        """ Load a JSONL file written by `export_graph`; return the number of records. """
+
+        return self.import_records(read_records(file), batch_size)
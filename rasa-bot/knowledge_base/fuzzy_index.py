@@ -0,0 +1,130 @@
+"""
+Fuzzy lookup of the stored entities, used when the exact match of a request finds nothing (a lemmatizer miss,
+diacritics lost by the speech recognition, another preposition).
+
+The values of the class and instance nodes are indexed by the trigrams of their normalized form (lowercase, without
+diacritics), so a lookup only visits the values that share trigrams with the request. The values sharing the most
+trigrams are then ranked by their edit similarity to the request.
+"""
+
+import heapq
+import unicodedata
+from collections import Counter, defaultdict
+
+# minimum edit similarity of the resolved entities
+FUZZY_THRESHOLD = 0.75
+
+
+def normalize(text):
+    """ Lowercase the text and remove its diacritics ("Șertarul" -> "sertarul"). """
+
+    text = unicodedata.normalize('NFKD', text.lower())
+    return ' '.join(''.join(c for c in text if not unicodedata.combining(c)).split())
+
+
+def trigrams(text):
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_similarity(a, b):
+    """ 1 - Levenshtein distance of the strings / length of the longer one. """
+
+    if not a or not b:
+        return float(a == b)
+
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+
+    return 1 - previous[-1] / max(len(a), len(b))
+
+
+def entity_values(entity):
+    """
+    (value, node) pairs of the class and instance nodes of an entity, with the values given to them by
+    `QueryBuilder.query_create_noun_phrase`; a node is ("class", lemma, pre) or ("instance", value).
+    """
+
+    def collect(entity):
+        pre = entity.get('pre', "")
+        pairs = [(entity['lemma'], ("class", entity['lemma'], pre))]
+        string = (pre + " " + entity['value']).strip()
+        if not entity['specifiers']:
+            return pairs, string
+
+        for spec in entity['specifiers']:
+            inner_pairs, inner_str = collect(spec)
+            pairs += inner_pairs
+            string += " " + inner_str
+
+        return pairs + [(string, ("instance", string))], string
+
+    return collect(entity)[0]
+
+
+def request_value(entity):
+    """ Value looked up for a requested entity: the lemma of a single noun or the phrase of an instance. """
+
+    return entity_values(entity)[-1][0]
+
+
+class TrigramIndex:
+    """ Inverted index of the entities by the trigrams of their values. """
+
+    def __init__(self, shortlist=20):
+        self.shortlist = shortlist  # number of values ranked by edit similarity
+        self.keys = []  # normalized values
+        self.sizes = []  # number of trigrams of each value
+        self.entities = []  # entities of each value
+        self.key_ids = {}
+        self.postings = defaultdict(list)  # trigram -> ids of the values
+
+    def add(self, value, entity):
+        key = normalize(value)
+        if not key:
+            return
+
+        i = self.key_ids.get(key)
+        if i is None:
+            i = self.key_ids[key] = len(self.keys)
+            grams = trigrams(key)
+            self.keys.append(key)
+            self.sizes.append(len(grams))
+            self.entities.append([])
+            for gram in grams:
+                self.postings[gram].append(i)
+
+        if entity not in self.entities[i]:
+            self.entities[i].append(entity)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def search(self, value, threshold=FUZZY_THRESHOLD, k=5):
+        """
+        Find the entities with values similar to the given value.
+
+        :return up to k (entity, similarity) pairs with a similarity of at least `threshold`, the most similar first
+        """
+
+        key = normalize(value)
+        grams = trigrams(key)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.postings.get(gram, ()))
+
+        # shortlist by the Dice coefficient of the trigram sets
+        shortlist = heapq.nlargest(self.shortlist, shared, key=lambda i: shared[i] / (len(grams) + self.sizes[i]))
+
+        matches = []
+        for i in shortlist:
+            similarity = edit_similarity(key, self.keys[i])
+            if similarity >= threshold:
+                matches.extend((entity, similarity) for entity in self.entities[i])
+
+        matches.sort(key=lambda match: -match[1])
+        return matches[:k]
@@ -0,0 +1,91 @@
+"""
+Export and import of the knowledge graph as newline-delimited JSON (JSONL), for backups, migrations between the
+backends (DbBridge, MemoryBridge) and seeding benchmark datasets.
+
+A file holds all the nodes of the graph, then all its relations (so a relation always comes after its end nodes):
+    {"node": 12, "labels": ["class"], "properties": {"value": "cheie", "pre": ""}}
+    {"rel": "IS_A", "start": 13, "end": 12, "properties": {"sender": "user-id"}}
+The node ids are only used for linking the relations of the file. The partition of a sender is made of the relations
+created for it (tagged with its `sender` property) and their end nodes; the class nodes are shared by all the senders
+and merged on import by their (value, pre) properties.
+
+Run from the rasa-bot folder (with the Neo4j database started):
+    python -m knowledge_base.graph_io export backup.jsonl.gz [-s sender-id]
+    python -m knowledge_base.graph_io import backup.jsonl.gz
+"""
+
+import gzip
+import json
+import re
+import time
+
+import plac
+
+# labels and relation types are written in the queries, since they can't be query parameters
+NAME_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+def open_jsonl(file, mode='r'):
+    if str(file).endswith('.gz'):
+        return gzip.open(file, mode + 't', encoding='utf-8')
+    return open(file, mode, encoding='utf-8')
+
+
+def write_records(records, file):
+    """ Write the node and relation records to a JSONL file (.gz files are compressed); return their number. """
+
+    count = 0
+    with open_jsonl(file, 'w') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            count += 1
+
+    return count
+
+
+def read_records(file):
+    with open_jsonl(file) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def check_name(name):
+    if not NAME_PATTERN.match(name):
+        raise ValueError(f'invalid label or relation type: {name!r}')
+    return name
+
+
+def batches(records, batch_size):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+@plac.annotations(
+    command=("export or import", "positional", None, str, ["export", "import"]),
+    file=("JSONL file (compressed if it ends with .gz)", "positional", None, str),
+    sender=("Export only the partition of this sender", "option", "s", str),
+    batch_size=("Nodes/relations read or written per query", "option", "b", int),
+)
+def main(command, file, sender=None, batch_size=5000):
+    from knowledge_base.db_bridge import DbBridge
+
+    bridge = DbBridge()
+    start = time.perf_counter()
+    if command == "export":
+        count = bridge.export_graph(file, sender, batch_size)
+    else:
+        count = bridge.import_graph(file, batch_size)
+
+    elapsed = time.perf_counter() - start
+    print(f'{command}ed {count} records in {elapsed:.1f} s ({count / max(elapsed, 1e-9):.0f} records/s)')
+
+
+if __name__ == "__main__":
+    plac.call(main)
@@ -0,0 +1,287 @@
+"""
+In-process stand-in for the Neo4j knowledge base, used to run the action server offline (load tests, CI).
+
+It keeps the same graph model as the queries built by `QueryBuilder` (class/instance nodes linked through IS_A, SPEC,
+HAS, ACTION, CE, LOC and info type relations) and mirrors their matching rules.
+"""
+
+from itertools import product
+
+from .db_bridge import prettify_result
+from .fuzzy_index import TrigramIndex, request_value
+from .graph_io import write_records, read_records
+from .types import InfoType
+from .vector_index import VectorIndex
+from metrics import DB_QUERY_LATENCY, FUZZY_RESOLUTIONS, timed
+
+
+class Node:
+    def __init__(self, label, value, pre=None):
+        self.label = label
+        self.value = value
+        self.pre = pre
+        self.out = []  # (relation type, node, sender)
+        self.inc = []  # (relation type, node, sender)
+
+    def link(self, rel, node, sender=None):
+        self.out.append((rel, node, sender))
+        node.inc.append((rel, self, sender))
+
+    def targets(self, rel):
+        return [node for (r, node, _) in self.out if r == rel]
+
+    def sources(self, rel):
+        return [node for (r, node, _) in self.inc if r == rel]
+
+
+class MemoryBridge:
+    def __init__(self, embedder=None, fuzzy=True):
+        # class nodes indexed by their (value, pre) properties
+        self.classes = {}
+        # number of nodes and relations of the graph
+        self.size = 0
+        # class and instance nodes indexed by the trigrams of their values and, given an embedder, by their vectors
+        # (unless the requests without an exact match are resolved elsewhere, e.g. for the replicas of the partitions)
+        self.fuzzy_index = TrigramIndex() if fuzzy else None
+        self.embedder = embedder
+        self.vector_index = VectorIndex(embedder.dim) if embedder and fuzzy else None
+
+    def __index_value(self, value, node):
+        if self.fuzzy_index is not None:
+            self.fuzzy_index.add(value, node)
+        if self.vector_index is not None:
+            self.vector_index.add(value, node, self.embedder(value))
+
+    def __node(self, label, value, pre=None):
+        self.size += 1
+        return Node(label, value, pre)
+
+    def __link(self, source, rel, target, sender):
+        self.size += 1
+        source.link(rel, target, sender)
+
+    def __class_node(self, entity, match_existing):
+        key = (entity['lemma'], entity.get('pre', ""))
+        nodes = self.classes.setdefault(key, [])
+        if match_existing and nodes:
+            return nodes[0]
+
+        node = self.__node('class', *key)
+        nodes.append(node)
+        self.__index_value(node.value, node)
+        return node
+
+    def __create_noun_phrase(self, entity, match_existing=False, sender=None):
+        """
+        Insert an entity into the graph (same structure and values as `QueryBuilder.query_create_noun_phrase`).
+
+        :return the entity node and the phrase of the entity
+        """
+
+        cls = self.__class_node(entity, match_existing)
+        # the phrase of the entity, with its preposition and surface form (the value of its instance node)
+        string = (entity.get('pre', "") + " " + entity['value']).strip()
+        if not entity['specifiers']:
+            return cls, string
+
+        instance = self.__node('instance', None)
+        self.__link(instance, 'IS_A', cls, sender)
+
+        for spec in entity['specifiers']:
+            inner, inner_str = self.__create_noun_phrase(spec, True, sender)
+
+            if spec['question'] in ['care', 'ce fel de']:
+                self.__link(instance, 'SPEC', inner, sender)
+            elif spec['question'] == 'al cui':
+                self.__link(inner, 'HAS', instance, sender)
+
+            string += " " + inner_str
+
+        instance.value = string
+        self.__index_value(string, instance)
+        return instance, string
+
+    def __match_noun_phrase(self, entity):
+        """ Find the nodes of an entity (same matching rules as `QueryBuilder.query_match_noun_phrase`). """
+
+        classes = self.classes.get((entity['lemma'], entity.get('pre', "")), [])
+        candidates = list(classes) + [instance for cls in classes for instance in cls.sources('IS_A')]
+
+        for spec in entity['specifiers']:
+            inner_nodes = self.__match_noun_phrase(spec)
+
+            if spec['question'] in ['care', 'ce fel de']:
+                candidates = [node for node in candidates if any(n in inner_nodes for n in node.targets('SPEC'))]
+            elif spec['question'] == 'al cui':
+                candidates = [node for node in candidates if any(n in inner_nodes for n in node.sources('HAS'))]
+
+        return candidates
+
+    def set_value(self, entity, value, type=InfoType.VAL, sender=None):
+        """ Store a detail of an entity in the database (in the partition of the sender, if given). """
+
+        with timed(DB_QUERY_LATENCY, f'set_value:{type.value}'):
+            node, _ = self.__create_noun_phrase(entity, match_existing=True, sender=sender)
+
+            if type == InfoType.VAL:
+                self.__link(node, type.value, self.__node('val', value), sender)
+            elif type == InfoType.LOC:
+                location, _ = self.__create_noun_phrase(value, sender=sender)
+                self.__link(node, type.value, location, sender)
+            elif type in [InfoType.TIME_POINT, InfoType.TIME_START, InfoType.TIME_END,
+                          InfoType.TIME_RANGE, InfoType.TIME_DURATION]:
+                self.__link(node, type.value, self.__node('time', value), sender)
+
+    def get_value(self, entity, type=InfoType.VAL, sender=None):
+        """ Get a detail of an entity from the database. """
+
+        with timed(DB_QUERY_LATENCY, f'get_value:{type.value}'):
+            values = self.match_value(entity, type)
+            if not values and self.fuzzy_index is not None:
+                values = self.__get_similar_value(entity, type)
+
+        return prettify_result(values)
+
+    def match_value(self, entity, type=InfoType.VAL):
+        """ [detail, entity value] results of the exact match of an entity. """
+
+        return [[val.value, node.value]
+                for node in self.__match_noun_phrase(entity) for val in node.targets(type.value)]
+
+    def __get_similar_value(self, entity, type):
+        """ Get the detail of the most similar stored entity that has it (same rules as `DbBridge`). """
+
+        value = request_value(entity)
+        tiers = [("trigram", self.fuzzy_index.search(value))]
+        if self.vector_index is not None:
+            tiers.append(("vector", self.vector_index.search(self.embedder(value))))
+
+        for tier, candidates in tiers:
+            for node, _ in candidates:
+                nodes = [node] + node.sources('IS_A') if node.label == 'class' else [node]
+                values = [[val.value, n.value] for n in nodes for val in n.targets(type.value)]
+                if values:
+                    FUZZY_RESOLUTIONS.inc(tier)
+                    return values
+
+        FUZZY_RESOLUTIONS.inc("unresolved")
+        return []
+
+    def store_action(self, components, sender=None):
+        """
+        Store a complete action of a subject, eventually together with other semantic entities
+        (like location, timestamp, direct object, etc.).
+        """
+
+        with timed(DB_QUERY_LATENCY, 'store_action'):
+            subj, _ = self.__create_noun_phrase(components['subj'], match_existing=True, sender=sender)
+
+            act = self.__node('action', components['action'])
+            self.__link(subj, 'ACTION', act, sender)
+
+            if components['ce']:
+                self.__link(act, 'CE', self.__create_noun_phrase(components['ce'], sender=sender)[0], sender)
+
+            for loc in components['loc']:
+                self.__link(act, 'LOC', self.__create_noun_phrase(loc, sender=sender)[0], sender)
+
+            for time in components['time']:
+                self.__link(act, time[1].value, self.__node('time', time[0]), sender)
+
+    def get_action_time(self, components, info_type=InfoType.TIME_POINT, sender=None):
+        """
+        Get timestamp of an action expressed through a complex sentence
+        (containing more than the entity whose time is requested).
+        """
+
+        with timed(DB_QUERY_LATENCY, f'get_action_time:{info_type.value}'):
+            values = self.match_action_time(components, info_type)
+
+        return prettify_result(values)
+
+    def match_action_time(self, components, info_type=InfoType.TIME_POINT):
+        """ [time, subject value, noun phrase values...] results of the match of an action. """
+
+        values = []
+        for subj in self.__match_noun_phrase(components['subj']):
+            for act in subj.targets('ACTION'):
+                if act.value != components['action']:
+                    continue
+                if not all(any(t.value == time[0] for t in act.targets(time[1].value))
+                           for time in components['time']):
+                    continue
+
+                # every noun phrase of the request has to be linked to the action
+                phrase_options = []
+                if components['ce']:
+                    ce_nodes = self.__match_noun_phrase(components['ce'])
+                    phrase_options.append([n for n in act.targets('CE') if n in ce_nodes])
+                for loc in components['loc']:
+                    loc_nodes = self.__match_noun_phrase(loc)
+                    phrase_options.append([n for n in act.targets('LOC') if n in loc_nodes])
+
+                for nodes in product(*phrase_options):
+                    for time in act.targets(info_type.value):
+                        values.append([time.value, subj.value] + [node.value for node in nodes])
+
+        return values
+
+    def __nodes(self):
+        """ All the nodes of the graph (each node is linked, directly or not, to a class node). """
+
+        nodes = {id(node): node for cls_nodes in self.classes.values() for node in cls_nodes}
+        queue = list(nodes.values())
+        for node in queue:
+            for _, other, _ in node.out + node.inc:
+                if id(other) not in nodes:
+                    nodes[id(other)] = other
+                    queue.append(other)
+
+        return nodes.values()
+
+    def export_records(self, sender=None):
+        """ The nodes and then the relations of the graph (or of the partition of a sender) as JSONL records. """
+
+        nodes = list(self.__nodes())
+        rels = [(node, rel, other, rel_sender) for node in nodes for rel, other, rel_sender in node.out
+                if sender is None or rel_sender == sender]
+        if sender is not None:
+            in_partition = {id(node) for node, _, other, _ in rels} | {id(other) for _, _, other, _ in rels}
+            nodes = [node for node in nodes if id(node) in in_partition]
+
+        for node in nodes:
+            properties = {"value": node.value} if node.value is not None else {}
+            if node.label == 'class':
+                properties["pre"] = node.pre
+            yield {"node": id(node), "labels": [node.label], "properties": properties}
+
+        for node, rel, other, rel_sender in rels:
+            yield {"rel": rel, "start": id(node), "end": id(other),
+                   "properties": {"sender": rel_sender} if rel_sender is not None else {}}
+
+    def export_graph(self, file, sender=None):
+        return write_records(self.export_records(sender), file)
+
+    def import_records(self, records):
+        """ Load node and relation records; the class nodes are merged with the existing ones. """
+
+        nodes, count = {}, 0
+        for record in records:
+            if "node" in record:
+                label, properties = record["labels"][0], record["properties"]
+                if label == 'class':
+                    nodes[record["node"]] = self.__class_node(
+                        {"lemma": properties["value"], "pre": properties.get("pre", "")}, match_existing=True)
+                else:
+                    nodes[record["node"]] = self.__node(label, properties.get("value"))
+                    if label == 'instance':
+                        self.__index_value(properties.get("value") or "", nodes[record["node"]])
+            else:
+                self.__link(nodes[record["start"]], record["rel"], nodes[record["end"]],
+                            record["properties"].get("sender"))
+            count += 1
+
+        return count
+
+    def import_graph(self, file):
+        return self.import_records(read_records(file))
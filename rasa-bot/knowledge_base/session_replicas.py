@@ -0,0 +1,141 @@
+"""
+In-process replicas of the partitions of the active senders, so the related questions of a conversation ("unde e
+cartea?", "și ochelarii?", "când am pus-o?") don't each need a round trip to Neo4j.
+
+The partition of a sender (the relations stored for it and their end nodes, see graph_io.py) is loaded into a
+`MemoryBridge` on its first read, together with its shared classes: the classes whose nodes or instances also have
+relations outside the partition (stored by other senders or without a sender). A read is answered by the exact match
+of the replica only if the requested entity is not of a shared class, since then the partition holds all its details;
+the other reads, and the ones without an answer in the replica, go to the database. The writes go to the database and
+to the replica of their sender, so the replica stays coherent with the partition, and share their classes in the
+replicas of the other senders. The writes of other processes are not seen by the replicas, which are dropped after the
+senders are idle for `max_idle` seconds. The total size of the replicas (nodes and relations) is capped, evicting the
+least recently used senders.
+"""
+
+import time
+from collections import OrderedDict
+
+from .db_bridge import prettify_result
+from .fuzzy_index import entity_values
+from .memory_bridge import MemoryBridge
+from .types import InfoType
+from metrics import REPLICA_READS
+
+
+def write_classes(*entities):
+    """ The (value, pre) of the class nodes written for some entities. """
+
+    return {node[1:] for entity in entities for _, node in entity_values(entity) if node[0] == "class"}
+
+
+class Replica:
+    def __init__(self, bridge, shared):
+        self.bridge = bridge
+        self.shared = shared  # (value, pre) of the shared classes
+        self.last_access = time.monotonic()
+
+    @property
+    def size(self):
+        return self.bridge.size
+
+
+class ReplicatedBridge:
+    """ Knowledge base bridge that answers the reads of a sender from an in-process replica of its partition. """
+
+    def __init__(self, db, max_size=200000, max_idle=1800):
+        self.db = db
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.replicas = OrderedDict()  # sender -> Replica, the least recently used first
+        self.size = 0
+
+    def __getattr__(self, name):
+        # export, import and the other operations of the database bridge
+        return getattr(self.db, name)
+
+    def replica(self, sender):
+        """ The replica of the partition of a sender, loaded on its first access. """
+
+        self.__evict_idle()
+
+        replica = self.replicas.get(sender)
+        if replica is None:
+            bridge = MemoryBridge(fuzzy=False)  # the requests without an exact match are resolved by the database
+            bridge.import_records(self.db.partition_records(sender))
+            replica = self.replicas[sender] = Replica(bridge, self.db.shared_classes(sender))
+            self.size += replica.size
+            self.__evict_over_size(keep=sender)
+
+        replica.last_access = time.monotonic()
+        self.replicas.move_to_end(sender)
+        return replica
+
+    def __evict_idle(self):
+        now = time.monotonic()
+        while self.replicas:
+            sender, replica = next(iter(self.replicas.items()))
+            if now - replica.last_access <= self.max_idle:
+                break
+            self.__evict(sender)
+
+    def __evict_over_size(self, keep):
+        while self.size > self.max_size and len(self.replicas) > 1:
+            sender = next(iter(self.replicas))
+            self.__evict(sender if sender != keep else list(self.replicas)[1])
+
+    def __evict(self, sender):
+        self.size -= self.replicas.pop(sender).size
+
+    def __replicate(self, sender, write, classes):
+        """ Apply a write to the replica of its sender and share its classes in the replicas of the other senders. """
+
+        for other, replica in self.replicas.items():
+            if other != sender:
+                replica.shared |= classes
+
+        if sender in self.replicas:
+            before = self.replicas[sender].size
+            write(self.replicas[sender].bridge)
+            self.size += self.replicas[sender].size - before
+            self.__evict_over_size(keep=sender)
+
+    def set_value(self, entity, value, type=InfoType.VAL, sender=None):
+        self.db.set_value(entity, value, type, sender)
+        self.__replicate(sender, lambda bridge: bridge.set_value(entity, value, type, sender),
+                         write_classes(entity, *([value] if type == InfoType.LOC else [])))
+
+    def store_action(self, components, sender=None):
+        self.db.store_action(components, sender)
+        self.__replicate(sender, lambda bridge: bridge.store_action(components, sender),
+                         write_classes(*filter(None, [components['subj'], components['ce']] + components['loc'])))
+
+    def __replica_values(self, sender, entity, match):
+        """ The results of a match in the replica of a sender, or None if the database has to be queried. """
+
+        if sender is None:
+            return None
+
+        replica = self.replica(sender)
+        if (entity['lemma'], entity.get('pre', "")) in replica.shared:
+            REPLICA_READS.inc("shared")
+            return None
+
+        values = match(replica.bridge)
+        REPLICA_READS.inc("hit" if values else "miss")
+        return values or None
+
+    def get_value(self, entity, type=InfoType.VAL, sender=None):
+        values = self.__replica_values(sender, entity, lambda bridge: bridge.match_value(entity, type))
+        if values:
+            return prettify_result(values)
+
+        return self.db.get_value(entity, type, sender)
+
+    def get_action_time(self, components, info_type=InfoType.TIME_POINT, sender=None):
+        values = self.__replica_values(sender, components['subj'],
+                                       lambda bridge: bridge.match_action_time(components, info_type))
+        if values:
+            return prettify_result(values)
+
+        return self.db.get_action_time(components, info_type, sender)
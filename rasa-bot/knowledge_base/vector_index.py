@@ -0,0 +1,150 @@
+"""
+Recall of the stored entities by the similarity of their word vectors, for the requests that name an entity with a
+synonym or another phrase ("mobilul" for "telefonul mobil"), used after the exact and the trigram matches fail.
+
+The values of the class and instance nodes are embedded when they are written (mean of the word vectors of a spaCy
+model) and kept in an inverted file index: the vectors are clustered with k-means and a lookup only compares the
+request with the vectors of the clusters nearest to it. Until the index is large enough for clustering, all the
+vectors are compared. The index is saved next to the graph, as a NumPy archive and a JSON list of the entities.
+"""
+
+import json
+import os
+
+import numpy as np
+
+VECTOR_INDEX_PATH = './data/kb-vectors'
+
+# minimum cosine similarity of the recalled entities
+MIN_SIMILARITY = 0.6
+
+
+class Embedder:
+    """ Sentence vectors of the values: the normalized mean of the word vectors of a spaCy model. """
+
+    def __init__(self, model):
+        import spacy
+        from vectors import mmap_vectors
+
+        self.nlp = mmap_vectors(spacy.load(model, disable=["tagger", "parser", "ner"]), model)
+
+    @property
+    def dim(self):
+        return self.nlp.vocab.vectors_length
+
+    def __call__(self, text):
+        """ Unit vector of the text or None if none of its words has a vector. """
+
+        vector = self.nlp.make_doc(text).vector
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else None
+
+
+class VectorIndex:
+    """ Inverted file index of unit vectors, with the entity of each vector. """
+
+    def __init__(self, dim, min_train_size=1024, nprobe=8):
+        self.min_train_size = min_train_size  # number of vectors from which they are clustered
+        self.nprobe = nprobe  # clusters searched by a lookup
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+        self.size = 0
+        self.entities = []
+        self.keys = set()  # (value, entity) pairs already indexed
+        self.centroids = None
+        self.clusters = None  # cluster of each vector
+        self.trained_size = 0
+
+    def add(self, value, entity, vector):
+        if vector is None or (value, entity) in self.keys:
+            return
+
+        if self.size == len(self.vectors):
+            # grow the array geometrically, so the vectors are copied O(log n) times
+            grown = np.zeros((max(2 * self.size, 64), self.vectors.shape[1]), dtype=np.float32)
+            grown[:self.size] = self.vectors[:self.size]
+            self.vectors = grown
+            if self.clusters is not None:
+                self.clusters = np.resize(self.clusters, len(grown))
+
+        self.vectors[self.size] = vector
+        self.entities.append(entity)
+        self.keys.add((value, entity))
+        self.size += 1
+
+        if self.size >= max(self.min_train_size, 4 * self.trained_size):
+            self.train()
+        elif self.centroids is not None:
+            self.clusters[self.size - 1] = np.argmax(self.centroids @ vector)
+
+    def train(self, n_iter=10, seed=0):
+        """ Cluster the vectors with spherical k-means (about sqrt(n) clusters). """
+
+        vectors = self.vectors[:self.size]
+        rng = np.random.RandomState(seed)
+        n_clusters = max(1, int(np.sqrt(self.size)))
+        centroids = vectors[rng.choice(self.size, n_clusters, replace=False)]
+
+        for _ in range(n_iter):
+            clusters = np.argmax(vectors @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, clusters, vectors)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = np.where(norms > 0, sums / np.where(norms > 0, norms, 1), centroids)
+
+        self.centroids = centroids
+        self.clusters = np.zeros(len(self.vectors), dtype=np.int32)
+        self.clusters[:self.size] = np.argmax(vectors @ centroids.T, axis=1)
+        self.trained_size = self.size
+
+    def search(self, vector, k=5, min_similarity=MIN_SIMILARITY):
+        """
+        Find the entities with the vectors most similar to the given one.
+
+        :return up to k (entity, similarity) pairs with a cosine similarity of at least `min_similarity`
+        """
+
+        if vector is None or not self.size:
+            return []
+
+        if self.centroids is None:
+            candidates = np.arange(self.size)
+        else:
+            nearest = np.argsort(-(self.centroids @ vector))[:self.nprobe]
+            candidates = np.flatnonzero(np.isin(self.clusters[:self.size], nearest))
+
+        similarities = self.vectors[candidates] @ vector
+        top = np.argsort(-similarities)[:k]
+        return [(self.entities[candidates[i]], float(similarities[i])) for i in top
+                if similarities[i] >= min_similarity]
+
+    def to_disk(self, path=VECTOR_INDEX_PATH):
+        arrays = {"vectors": self.vectors[:self.size]}
+        if self.centroids is not None:
+            arrays.update(centroids=self.centroids, clusters=self.clusters[:self.size])
+        np.savez(path + '.npz', **arrays)
+
+        with open(path + '.json', 'w', encoding='utf-8') as f:
+            json.dump({"keys": [[value, entity] for value, entity in self.keys], "entities": self.entities,
+                       "trained_size": self.trained_size}, f, ensure_ascii=False)
+
+    @staticmethod
+    def from_disk(path=VECTOR_INDEX_PATH, **kwargs):
+        """ Load a saved index or return None if there is none. """
+
+        if not os.path.exists(path + '.npz'):
+            return None
+
+        arrays = np.load(path + '.npz')
+        with open(path + '.json', 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        index = VectorIndex(arrays["vectors"].shape[1], **kwargs)
+        index.vectors = arrays["vectors"]
+        index.size = len(index.vectors)
+        index.entities = [tuple(entity) for entity in data["entities"]]
+        index.keys = {(value, tuple(entity)) for value, entity in data["keys"]}
+        if "centroids" in arrays:
+            index.centroids, index.clusters = arrays["centroids"], arrays["clusters"]
+            index.trained_size = data["trained_size"]
+
+        return index
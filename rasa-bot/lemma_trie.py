@@ -0,0 +1,178 @@
+"""
+Compact form -> lemma lookup table, stored as a minimal acyclic automaton (DAFSA) in flat arrays.
+
+The value of a form is not its lemma, but the rule that rewrites the form into its lemma (number of stripped letters
+and appended suffix, e.g. (3, "ă") for "mesele" -> "masă"), so the inflections of different words share both their
+prefixes and their suffixes: the automaton is built incrementally from the sorted forms, merging the equivalent
+nodes. The nodes and their edges are stored in `array`s (4 bytes per node/edge), so a table takes a fraction of the
+memory of a dict of full strings, and a word is looked up in a single pass over its letters.
+
+The tables are loaded like spaCy lookup tables and have the same interface: `word in table`, `table[word]` and
+`table.get(word, default)`.
+"""
+
+import json
+from array import array
+from bisect import bisect_left
+
+TRIE_SUFFIX = '.trie'
+
+
+class _BuildNode:
+    __slots__ = ['children', 'value']
+
+    def __init__(self):
+        self.children = {}
+        self.value = -1
+
+
+class LemmaTrie:
+    """ Read-only form -> lemma table backed by a DAFSA. """
+
+    def __init__(self, size, rules, first_edge, values, labels, targets):
+        self.size = size  # number of forms
+        self.rules = rules  # (strip, append) rewrite rules, indexed by the node values
+        self.first_edge = first_edge  # edges of node i: first_edge[i]..first_edge[i + 1]
+        self.values = values  # rule index of the nodes that end a form (-1 for the other nodes)
+        self.labels = labels  # edge letters (code points), sorted for each node
+        self.targets = targets  # edge target nodes
+
+    @staticmethod
+    def from_dict(lemmas):
+        """ Build the automaton of a {form: lemma} dict. """
+
+        rules, rule_ids = [], {}
+        register = {}
+        root = _BuildNode()
+        path, previous = [root], ''
+
+        def minimize(down_to):
+            # replace the nodes of the previous word deeper than `down_to` with their registered equivalents
+            for depth in range(len(path) - 1, down_to, -1):
+                node = path[depth]
+                signature = (node.value, tuple((letter, id(child)) for letter, child in sorted(node.children.items())))
+                if signature in register:
+                    path[depth - 1].children[previous[depth - 1]] = register[signature]
+                else:
+                    register[signature] = node
+            del path[down_to + 1:]
+
+        for form in sorted(lemmas):
+            lemma = lemmas[form]
+            prefix = 0
+            while prefix < min(len(form), len(lemma)) and form[prefix] == lemma[prefix]:
+                prefix += 1
+            rule = (len(form) - prefix, lemma[prefix:])
+            if rule not in rule_ids:
+                rule_ids[rule] = len(rules)
+                rules.append(rule)
+
+            common = 0
+            while common < min(len(form), len(previous)) and form[common] == previous[common]:
+                common += 1
+            minimize(common)
+
+            node = path[-1]
+            for letter in form[common:]:
+                node.children[letter] = _BuildNode()
+                node = node.children[letter]
+                path.append(node)
+            node.value = rule_ids[rule]
+            previous = form
+
+        minimize(0)
+        return LemmaTrie.__flatten(root, len(lemmas), rules)
+
+    @staticmethod
+    def __flatten(root, size, rules):
+        """ Number the nodes breadth-first and store their edges in arrays. """
+
+        ids = {id(root): 0}
+        order = [root]
+        first_edge, values, labels, targets = array('I', [0]), array('i'), array('I'), array('I')
+
+        for node in order:
+            values.append(node.value)
+            for letter, child in sorted(node.children.items()):
+                if id(child) not in ids:
+                    ids[id(child)] = len(order)
+                    order.append(child)
+                labels.append(ord(letter))
+                targets.append(ids[id(child)])
+            first_edge.append(len(labels))
+
+        return LemmaTrie(size, rules, first_edge, values, labels, targets)
+
+    def __find(self, word):
+        """ Index of the rule of the word or -1 if the word is not in the table. """
+
+        node = 0
+        for letter in word:
+            start, end = self.first_edge[node], self.first_edge[node + 1]
+            code = ord(letter)
+            i = bisect_left(self.labels, code, start, end)
+            if i == end or self.labels[i] != code:
+                return -1
+            node = self.targets[i]
+
+        return self.values[node]
+
+    def get(self, word, default=None):
+        rule = self.__find(word)
+        if rule < 0:
+            return default
+
+        strip, append = self.rules[rule]
+        return word[:len(word) - strip] + append
+
+    def __contains__(self, word):
+        return self.__find(word) >= 0
+
+    def __getitem__(self, word):
+        lemma = self.get(word)
+        if lemma is None:
+            raise KeyError(word)
+        return lemma
+
+    def __len__(self):
+        return self.size
+
+    def items(self):
+        """ Iterate the (form, lemma) pairs in alphabetical order. """
+
+        stack = [(0, '')]
+        while stack:
+            node, prefix = stack.pop()
+            if self.values[node] >= 0:
+                strip, append = self.rules[self.values[node]]
+                yield prefix, prefix[:len(prefix) - strip] + append
+
+            for i in reversed(range(self.first_edge[node], self.first_edge[node + 1])):
+                stack.append((self.targets[i], prefix + chr(self.labels[i])))
+
+    def nbytes(self):
+        """ Size of the arrays of the automaton. """
+
+        return sum(a.itemsize * len(a) for a in [self.first_edge, self.values, self.labels, self.targets])
+
+    def to_disk(self, file):
+        """ Save the table as a JSON header line (rules and array sizes) followed by the raw arrays. """
+
+        header = {"size": self.size, "rules": self.rules, "nodes": len(self.values), "edges": len(self.labels)}
+        with open(file, 'wb') as f:
+            f.write(json.dumps(header, ensure_ascii=False).encode('utf-8') + b'\n')
+            for a in [self.first_edge, self.values, self.labels, self.targets]:
+                a.tofile(f)
+
+    @staticmethod
+    def from_disk(file):
+        with open(file, 'rb') as f:
+            header = json.loads(f.readline().decode('utf-8'))
+            arrays = []
+            for typecode, size in [('I', header["nodes"] + 1), ('i', header["nodes"]),
+                                   ('I', header["edges"]), ('I', header["edges"])]:
+                a = array(typecode)
+                a.fromfile(f, size)
+                arrays.append(a)
+
+        return LemmaTrie(header["size"], [tuple(rule) for rule in header["rules"]], *arrays)
@@ -0,0 +1,202 @@
+"""
+Latency histograms and counters exposed in the Prometheus text format.
+
+The bucket arrays of each series are allocated once, when the series is first observed; afterwards an observation
+is a binary search plus two in-place increments, without taking any lock (the updates rely on the GIL).
+"""
+
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+# upper bounds (in seconds) of the latency buckets
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """ Cumulative latency histogram with one series for each value of its label. """
+
+    def __init__(self, name, description, label, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.label = label
+        self.buckets = tuple(buckets)
+        self.series = {}
+
+    def observe(self, label_value, value):
+        series = self.series.get(label_value)
+        if series is None:
+            # one counter per bucket, one for +Inf and the sum of the observed values
+            series = self.series.setdefault(label_value, [0] * (len(self.buckets) + 1) + [0.0])
+
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.description}', f'# TYPE {self.name} histogram']
+
+        for label_value, series in sorted(self.series.items()):
+            label = f'{self.label}="{_escape(label_value)}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {cumulative}')
+            cumulative += series[-2]
+            lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{label}}} {series[-1]}')
+            lines.append(f'{self.name}_count{{{label}}} {cumulative}')
+
+        return lines
+
+
+class Counter:
+    """ Monotonic counter with one series for each value of its label. """
+
+    def __init__(self, name, description, label):
+        self.name = name
+        self.description = description
+        self.label = label
+        self.series = {}
+
+    def inc(self, label_value, amount=1):
+        self.series[label_value] = self.series.get(label_value, 0) + amount
+
+    def get(self, label_value):
+        return self.series.get(label_value, 0)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.description}', f'# TYPE {self.name} counter']
+        for label_value, count in sorted(self.series.items()):
+            lines.append(f'{self.name}{{{self.label}="{_escape(label_value)}"}} {count}')
+
+        return lines
+
+
+class Registry:
+    """ Collection of the metrics of a process. """
+
+    def __init__(self):
+        self.metrics = {}
+
+    def histogram(self, name, description, label, buckets=DEFAULT_BUCKETS):
+        return self.metrics.setdefault(name, Histogram(name, description, label, buckets))
+
+    def counter(self, name, description, label):
+        return self.metrics.setdefault(name, Counter(name, description, label))
+
+    def render(self):
+        """ Build the Prometheus text exposition of all the metrics. """
+
+        lines = []
+        for name in sorted(self.metrics):
+            lines += self.metrics[name].render()
+
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(label_value):
+    return str(label_value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+REGISTRY = Registry()
+
+NLU_STAGE_LATENCY = REGISTRY.histogram("nlu_stage_latency_seconds",
+                                       "Latency of the stages of the custom NLU components", "stage")
+ACTION_LATENCY = REGISTRY.histogram("action_latency_seconds", "Latency of the custom actions", "action")
+ACTION_ERRORS = REGISTRY.counter("action_errors_total", "Custom actions that raised an exception", "action")
+DB_QUERY_LATENCY = REGISTRY.histogram("db_query_latency_seconds",
+                                      "Round trip latency of the knowledge base queries", "query")
+DB_QUERY_ERRORS = REGISTRY.counter("db_query_errors_total", "Knowledge base queries that failed", "query")
+LEMMATIZER_LOOKUPS = REGISTRY.counter("lemmatizer_lookups_total",
+                                      "Lemmatized nouns and verbs by the tier that found their lemma", "tier")
+PARSER_PATHS = REGISTRY.counter("syntactic_parser_paths_total",
+                                "Messages parsed by the template fast path or the neural parser", "path")
+FAST_PATH_VERIFICATIONS = REGISTRY.counter("syntactic_parser_fast_path_verifications_total",
+                                           "Template parses compared with the neural parser", "result")
+SKIPPED_PARSES = REGISTRY.counter("syntactic_parser_skipped_total",
+                                  "Messages not parsed because their intent doesn't need semantic roles", "intent")
+DISCARDED_PARSES = REGISTRY.counter("syntactic_parser_discarded_total",
+                                    "Messages parsed concurrently (already started when their intent was known) whose "
+                                    "intent doesn't need semantic roles", "intent")
+PARSER_CORRECTIONS = REGISTRY.counter("syntactic_parser_corrections_total",
+                                      "Parse corrections by their use in the online updates of the parser "
+                                      "(accepted/rejected update or token_mismatch)", "result")
+SPECULATIVE_PARSES = REGISTRY.counter("speculative_parses_total",
+                                      "Final voice messages by whether their parse was computed from interim results "
+                                      "(reused), computed for another text (wasted) or not computed (missed)",
+                                      "result")
+CLASS_CACHE_LOOKUPS = REGISTRY.counter("kb_class_cache_lookups_total",
+                                       "Class nodes of the knowledge base writes found in the interning cache",
+                                       "result")
+REPLICA_READS = REGISTRY.counter("kb_replica_reads_total",
+                                 "Knowledge base reads answered by the replica of the sender's partition (hit) "
+                                 "or by the database (miss, shared entity)", "result")
+KB_WRITE_LATENCY = REGISTRY.histogram("kb_write_latency_seconds",
+                                      "Latency of the knowledge base writes by how their class nodes were bound "
+                                      "(interned/mixed/merged)", "classes")
+FUZZY_RESOLUTIONS = REGISTRY.counter("kb_fuzzy_resolutions_total",
+                                     "Requests without an exact match by the index of the similar entity that "
+                                     "answered them (trigram/vector) or unresolved",
+                                     "result")
+
+
+@contextmanager
+def timed(histogram, label_value):
+    """ Observe the time spent inside the `with` block. """
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(label_value, time.perf_counter() - start)
+
+
+def timed_action(run):
+    """ Decorator for the `run`/`submit` methods of the custom actions that records their latency and failures. """
+
+    @wraps(run)
+    def wrapper(self, *args, **kwargs):
+        action = self.name()
+        start = time.perf_counter()
+        try:
+            return run(self, *args, **kwargs)
+        except Exception:
+            ACTION_ERRORS.inc(action)
+            raise
+        finally:
+            ACTION_LATENCY.observe(action, time.perf_counter() - start)
+
+    return wrapper
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    """ Serve the metrics of the registry on GET /metrics. """
+
+    def do_GET(self):
+        if self.path.rstrip('/') != '/metrics':
+            self.send_error(404)
+            return
+
+        body = REGISTRY.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # keep the scrapes out of the server's log
+        pass
+
+
+def start_http_server(port, addr=''):
+    """ Expose the metrics on http://<addr>:<port>/metrics from a daemon thread. """
+
+    server = ThreadingHTTPServer((addr, port), MetricsRequestHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
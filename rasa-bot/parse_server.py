@@ -0,0 +1,170 @@
+"""
+HTTP service for the syntactic parser, used by the syntactic annotator and other web clients.
+
+POST / with a JSON body, either a single sentence or a batch:
+    {"text": "unde e cartea", "svg": true}
+    {"texts": ["unde e cartea", "cartea e pe masă"]}
+returns the parse of each sentence (tokens, heads, syntactic questions and semantic roles), with the displaCy SVG of
+the dependency tree when "svg" is true:
+    {"text": ..., "tokens": [...], "heads": [...], "deps": [...], "semantic_roles": [...], "svg": "<svg ..."}
+    {"results": [...]}
+
+The requests are served by a thread each, but the sentences of the concurrent requests are parsed by a single
+thread, in batches collected within a small time window (`nlp.pipe` is much faster on batches and the spaCy
+pipeline is not thread-safe).
+
+Run from the rasa-bot folder:
+    python -m parse_server -p 3333
+"""
+
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import plac
+from spacy import displacy
+
+from syntactic_parser import SyntacticParser
+
+PORT_NUMBER = 3333
+
+DISPLACY_OPTIONS = {"compact": True, "fine_grained": False}
+
+
+class MicroBatcher(threading.Thread):
+    """ Thread that parses the sentences of the queued requests in batches. """
+
+    def __init__(self, parser, window=0.005, max_batch_size=256):
+        super().__init__(name="parse-batcher", daemon=True)
+
+        self.parser = parser
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.requests = queue.Queue()
+
+    def submit(self, texts):
+        """ Queue the sentences of a request; the future is resolved with the list of their parses. """
+
+        future = Future()
+        self.requests.put((texts, future))
+        return future
+
+    def run(self):
+        while True:
+            batch = [self.requests.get()]
+            size = len(batch[0][0])
+
+            # collect the requests that come within the time window
+            deadline = time.perf_counter() + self.window
+            while size < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self.requests.get(timeout=timeout))
+                    size += len(batch[-1][0])
+                except queue.Empty:
+                    break
+
+            self.parse(batch)
+
+    def parse(self, batch):
+        texts = [text.lower() for texts, _ in batch for text in texts]
+        try:
+            docs = list(self.parser.nlp_spacy.pipe(texts))
+            results = [(doc, self.to_json(doc)) for doc in docs]
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        start = 0
+        for texts, future in batch:
+            future.set_result(results[start:start + len(texts)])
+            start += len(texts)
+
+    def to_json(self, doc):
+        return {
+            "text": doc.text,
+            "tokens": [token.text for token in doc],
+            "heads": [token.head.i for token in doc],
+            "deps": [token.dep_ for token in doc],
+            "semantic_roles": self.parser.extract_semantic_roles(doc),
+        }
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    batcher = None
+
+    def send_json(self, status, body):
+        content = json.dumps(body, ensure_ascii=False).encode("utf-8")
+
+        self.send_response(status)
+        self.send_header('Content-type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(content)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(content)
+
+    # Handler for the CORS preflight requests
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
+
+    # Handler for the POST requests
+    def do_POST(self):
+        try:
+            content_len = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(content_len).decode("utf-8"))
+            texts = [body["text"]] if "text" in body else body["texts"]
+            if not all(isinstance(text, str) for text in texts):
+                raise TypeError("the sentences must be strings")
+        except (ValueError, KeyError, TypeError) as e:
+            self.send_json(400, {"error": f'expected {{"text": ...}} or {{"texts": [...]}}: {e}'})
+            return
+
+        try:
+            parses = self.batcher.submit(texts).result() if texts else []
+        except Exception as e:
+            self.send_json(500, {"error": str(e)})
+            return
+
+        results = []
+        for doc, result in parses:
+            # render on demand, in the request thread
+            if body.get("svg"):
+                result = dict(result, svg=displacy.render(doc, style="dep", options=DISPLACY_OPTIONS))
+            results.append(result)
+
+        self.send_json(200, results[0] if "text" in body else {"results": results})
+
+    def log_message(self, format, *args):
+        pass
+
+
+@plac.annotations(
+    port=("Port of the server", "option", "p", int),
+    window=("Time window (ms) for batching the concurrent requests", "option", "w", float),
+    max_batch_size=("Maximum number of sentences of a batch", "option", "b", int),
+)
+def main(port=PORT_NUMBER, window=5.0, max_batch_size=256):
+    batcher = MicroBatcher(SyntacticParser(), window / 1000, max_batch_size)
+    batcher.start()
+    RequestHandler.batcher = batcher
+
+    server = ThreadingHTTPServer(('', port), RequestHandler)
+    print('Started the parse server on port', port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    plac.call(main)
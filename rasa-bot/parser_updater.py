@@ -0,0 +1,180 @@
+"""
+Online updates of the syntactic parser from corrected parses of live utterances.
+
+Corrections (the confirmed heads and syntactic questions of an utterance) are submitted through the
+/webhooks/corrections/ endpoint, appended to the corrections dataset and, while the online updates are enabled, queued
+for the updater thread of the `SyntacticParser` component. The updater fine-tunes a private copy of the parser on the
+new corrections mixed with replayed training examples (to avoid forgetting) and, if its accuracy on the test set is
+within `tolerance` of the best accuracy so far (at least the accuracy of the originally loaded model), swaps it in.
+The served model is replaced by reassigning a single reference, so a message is always parsed by one consistent model.
+"""
+
+import queue
+import random
+import threading
+
+import spacy
+from spacy.util import minibatch
+
+from metrics import PARSER_CORRECTIONS
+from syntactic_dataset import TRAIN_PATH, TEST_PATH, CORRECTIONS_PATH, dependency_types, read_examples, append_example
+from vectors import mmap_vectors
+
+CORRECTIONS_FILE = CORRECTIONS_PATH / 'corrections-00000.jsonl'
+
+pending_corrections = queue.Queue()
+# set while a ParserUpdater consumes the pending corrections (they are only recorded in the dataset otherwise)
+updater_running = threading.Event()
+corrections_file_lock = threading.Lock()
+
+
+def submit_correction(text, heads, deps):
+    """
+    Record the confirmed parse of an utterance and queue it for the online updates.
+
+    :raise ValueError if the annotations are inconsistent
+    """
+
+    if len(heads) != len(deps):
+        raise ValueError("heads and deps must have the same length")
+    if any(not isinstance(head, int) or not 0 <= head < len(heads) for head in heads):
+        raise ValueError("heads must be token indices")
+    if any(dep not in dependency_types for dep in deps):
+        raise ValueError(f"deps must be among {dependency_types}")
+
+    # the component parses the lowercased text
+    annotations = {'heads': list(heads), 'deps': list(deps)}
+    with corrections_file_lock:
+        append_example(text.lower(), annotations, CORRECTIONS_FILE)
+    if updater_running.is_set():
+        pending_corrections.put((text.lower(), annotations))
+
+
+def sample(examples, size, rng):
+    """ Reservoir sample of a stream of examples. """
+
+    reservoir = []
+    for i, example in enumerate(examples):
+        if i < size:
+            reservoir.append(example)
+        else:
+            j = rng.randint(0, i)
+            if j < size:
+                reservoir[j] = example
+
+    return reservoir
+
+
+class ParserUpdater(threading.Thread):
+    """ Background thread that fine-tunes the parser on the submitted corrections and hot-swaps it. """
+
+    def __init__(self, component, model_path, output_path=None, min_corrections=5, wait=60, replay_ratio=3,
+                 replay_size=2000, n_iter=3, dropout=0.2, tolerance=0.005):
+        super().__init__(name="parser-updater", daemon=True)
+
+        self.component = component
+        self.model_path = model_path
+        self.output_path = output_path
+        self.min_corrections = min_corrections
+        self.wait = wait
+        self.replay_ratio = replay_ratio
+        self.replay_size = replay_size
+        self.n_iter = n_iter
+        self.dropout = dropout
+        self.tolerance = tolerance
+        self.rng = random.Random()
+
+    def run(self):
+        updater_running.set()
+        try:
+            self.consume_corrections()
+        finally:
+            updater_running.clear()
+
+    def consume_corrections(self):
+        # the model being fine-tuned is never served directly
+        self.candidate = spacy.load(self.model_path)
+        self.dev = list(read_examples(TEST_PATH))
+        self.replay = sample(read_examples(TRAIN_PATH), self.replay_size, self.rng)
+        # the updates are gated against the best accuracy so far, so their losses within the tolerance don't add up;
+        # the baseline is scored on the candidate (still a copy of the served model), since the served model is not
+        # thread-safe
+        self.original = self.best = self.score(self.candidate)
+
+        corrections = []
+        while True:
+            try:
+                corrections.append(pending_corrections.get(timeout=self.wait))
+                idle = False
+            except queue.Empty:
+                idle = True
+
+            # update after enough corrections or when no more corrections came for a while
+            if len(corrections) >= self.min_corrections or (corrections and idle):
+                self.update(corrections)
+                corrections = []
+
+    def score(self, nlp):
+        """ Accuracy of a model on the test set. """
+
+        # the evaluation code is an offline tool, only loaded with the online updates
+        from drafts.parser_evaluation import score_model
+        return score_model(nlp, self.dev)
+
+    def update(self, corrections):
+        aligned = [(text, annotations) for (text, annotations) in corrections
+                   if len(self.candidate.make_doc(text)) == len(annotations['heads'])]
+        if len(aligned) < len(corrections):
+            print(f"Parser update: {len(corrections) - len(aligned)} corrections skipped (their token counts don't "
+                  f"match the tokenization)")
+            PARSER_CORRECTIONS.inc("token_mismatch", len(corrections) - len(aligned))
+        corrections = aligned
+        if not corrections:
+            return
+
+        parser = self.candidate.get_pipe("parser")
+        accepted_weights = parser.to_bytes()
+
+        replayed = self.rng.sample(self.replay, min(len(self.replay), self.replay_ratio * len(corrections)))
+        examples = corrections + replayed
+
+        other_pipes = [pipe for pipe in self.candidate.pipe_names if pipe != "parser"]
+        with self.candidate.disable_pipes(*other_pipes):
+            optimizer = self.candidate.resume_training()
+            for itn in range(self.n_iter):
+                self.rng.shuffle(examples)
+                for batch in minibatch(examples, size=8):
+                    texts, annotations = zip(*batch)
+                    self.candidate.update(texts, annotations, sgd=optimizer, drop=self.dropout, losses={})
+
+            scores = self.score(self.candidate)
+
+        # accuracy gate
+        if scores["score"] < self.best["score"] - self.tolerance:
+            print(f"Parser update rejected: {scores} (best model: {self.best}, original model: {self.original})")
+            PARSER_CORRECTIONS.inc("rejected", len(corrections))
+            parser.from_bytes(accepted_weights)
+            return
+
+        print(f"Parser update accepted: {scores} (best model: {self.best}, original model: {self.original})")
+        PARSER_CORRECTIONS.inc("accepted", len(corrections))
+        if scores["score"] > self.best["score"]:
+            self.best = scores
+
+        # the accepted corrections replace random replayed examples once the replay set is full
+        for correction in corrections:
+            if len(self.replay) < self.replay_size:
+                self.replay.append(correction)
+            else:
+                self.replay[self.rng.randrange(self.replay_size)] = correction
+        self.swap()
+
+    def swap(self):
+        # the served model shares the memory-mapped vectors of the model directory
+        nlp = mmap_vectors(spacy.load(self.model_path), self.model_path)
+        nlp.get_pipe("parser").from_bytes(self.candidate.get_pipe("parser").to_bytes())
+
+        if self.output_path:
+            nlp.to_disk(self.output_path)
+
+        self.component.nlp_spacy = nlp
@@ -0,0 +1,64 @@
+"""
+Sentence templates of the utterances with a rigid shape, with the heads and syntactic questions of their tokens.
+
+They are filled with random words by the synthetic data generator (drafts/generate_syntactic_data.py) and matched
+against the messages by the fast path of the syntactic parser (template_parser.py).
+"""
+
+# each token is a word or a {SLOT}, replaced by a single word
+# the heads are token indices and the deps are the syntactic questions (see syntactic_dataset.py)
+TEMPLATES = [
+    # ------------------------------------ unde ------------------------------------
+    ("{ART} {A_FI} pe {NOUN}", [1, 1, 3, 1], ["cine", "ROOT", "prep", "unde"]),
+    ("{ART} {A_FI} în {NOUN}", [1, 1, 3, 1], ["cine", "ROOT", "prep", "unde"]),
+    ("{ART} {OWNER} {A_FI} la {NOUN}", [2, 0, 2, 4, 2], ["cine", "al cui", "ROOT", "prep", "unde"]),
+    ("am pus {ART} pe {NOUN}", [1, 1, 1, 4, 1], ["-", "ROOT", "ce", "prep", "unde"]),
+    ("am lăsat {ART} {OWNER} în {NOUN}", [1, 1, 1, 2, 5, 1], ["-", "ROOT", "ce", "al cui", "prep", "unde"]),
+    ("{PROPN} a pus {ART} sub {NOUN}", [2, 2, 2, 2, 5, 2], ["cine", "-", "ROOT", "ce", "prep", "unde"]),
+    ("unde {A_FI} {ART}", [1, 1, 1], ["unde", "ROOT", "cine"]),
+    ("unde {A_FI} {ART} {OWNER}", [1, 1, 1, 2], ["unde", "ROOT", "cine", "al cui"]),
+    ("unde am pus {ART}", [2, 2, 2, 2], ["unde", "-", "ROOT", "ce"]),
+    ("de unde a luat {PROPN} {ART}", [1, 3, 3, 3, 3, 3], ["prep", "unde", "-", "ROOT", "cine", "ce"]),
+
+    # ------------------------------------ care, ce fel de ------------------------------------
+    ("{ART} din {NOUN} {A_FI} {COLOR}", [3, 2, 0, 3, 3], ["cine", "prep", "care", "ROOT", "cum este"]),
+    ("{ART} de pe {NOUN} {A_FI} {COLOR}", [4, 3, 3, 0, 4, 4], ["cine", "-", "prep", "care", "ROOT", "cum este"]),
+    ("am cumpărat {ART} de {NOUN}", [1, 1, 1, 4, 2], ["-", "ROOT", "ce", "prep", "ce fel de"]),
+
+    # ------------------------------------ cum este, care este ------------------------------------
+    ("{ART} {A_FI} foarte {COLOR}", [1, 1, 3, 1], ["cine", "ROOT", "-", "cum este"]),
+    ("{ART} {OWNER} {A_FI} {NUM}", [2, 0, 2, 2], ["cine", "al cui", "ROOT", "care este"]),
+    ("care {A_FI} {ART} {OWNER}", [1, 1, 1, 2], ["care este", "ROOT", "cine", "al cui"]),
+
+    # ------------------------------------ când, cât timp ------------------------------------
+    ("{ART} expiră {TIME}", [1, 1, 1], ["cine", "ROOT", "când"]),
+    ("{ART} se termină {TIME}", [2, 2, 2, 2], ["cine", "-", "ROOT", "când"]),
+    ("{TIME} am fost la {NOUN}", [2, 2, 2, 4, 2], ["când", "-", "ROOT", "prep", "unde"]),
+    ("când expiră {ART}", [1, 1, 1], ["când", "ROOT", "cine"]),
+    ("când expiră {ART} {OWNER}", [1, 1, 1, 2], ["când", "ROOT", "cine", "al cui"]),
+    ("peste {NUM} zile expiră {ART}", [2, 2, 3, 3, 3], ["prep", "cât", "cât timp", "ROOT", "cine"]),
+    ("{ART} durează {NUM} ore", [1, 1, 3, 1], ["cine", "ROOT", "cât", "cât timp"]),
+    ("cât timp durează {ART}", [1, 2, 2, 2], ["cât", "cât timp", "ROOT", "cine"]),
+
+    # ------------------------------------ cât de des, la cât timp ------------------------------------
+    ("{PROPN} merge la {NOUN} o dată pe săptămână", [1, 1, 3, 1, 5, 1, 7, 1],
+     ["cine", "ROOT", "prep", "unde", "cât", "cât de des", "prep", "la cât timp"]),
+    ("{ART} se schimbă de {NUM} ori pe an", [2, 2, 2, 4, 5, 2, 7, 2],
+     ["cine", "-", "ROOT", "prep", "cât", "cât de des", "prep", "la cât timp"]),
+
+    # ------------------------------------ pe cine, cui ------------------------------------
+    ("{PROPN} o așteaptă pe {PROPN}", [2, 2, 2, 4, 2], ["cine", "pe cine", "ROOT", "prep", "pe cine"]),
+    ("{PROPN} a dat {ART} lui {PROPN}", [2, 2, 2, 2, 5, 2], ["cine", "-", "ROOT", "ce", "-", "cui"]),
+]
+
+SLOT_VALUES = {
+    "TIME": ["azi", "ieri", "mâine", "poimâine", "alaltăieri", "aseară", "diseară", "luni", "marți", "miercuri",
+             "joi", "vineri", "sâmbătă", "duminică"],
+    "COLOR": ["maro", "gri", "roz", "bej", "mov", "bordo", "kaki"],
+}
+
+# forms of "a fi" for singular/plural subjects
+A_FI = {
+    "e": (["e", "este", "era"], [8, 8, 1]),
+    "sunt": (["sunt", "erau"], [8, 1]),
+}
@@ -0,0 +1,147 @@
+"""
+Suffix-rewrite lemmatizer, used as a fallback for the words missing from the lemma lookup tables.
+
+A rule replaces a suffix of the inflected form by a suffix of the lemma (e.g. "-ele" -> "-ă" for "mesele" -> "masă").
+The rules are learned from the (form, lemma) pairs of a lookup table: every pair votes for its rule under each of the
+suffixes of the form that include the rewritten part plus up to `context` more letters, and the most voted rule of
+every suffix is kept. The known lemmas also vote for keeping the word as it is, since the tables only hold the
+forms that differ from their lemma and the rules would otherwise rewrite the lemmas too (e.g. "carte" -> "cartă");
+the lemmas still rewritten are added to the tables as their own lemma by compile_lemmas.py. The suffixes are compiled
+into a trie read from the end of the word, with the rules that only repeat the rule of a shorter suffix pruned, so a
+word is lemmatized in a single pass over its letters by the rule of its longest known suffix.
+"""
+
+import json
+from collections import Counter, defaultdict
+
+RULES_FILE = './data/lookups/suffix-rules.json'
+
+# letters of the word that are never rewritten
+MIN_STEM = 2
+
+# rule of the words that are their own lemma
+IDENTITY = (0, "")
+
+
+class SuffixTrie:
+    """ Node of the suffix trie: the rule (strip length, appended suffix) of its suffix and the longer suffixes. """
+
+    __slots__ = ['rule', 'children']
+
+    def __init__(self, rule=None):
+        self.rule = rule
+        self.children = {}
+
+    def to_list(self):
+        return [self.rule, {letter: child.to_list() for letter, child in self.children.items()}]
+
+    @staticmethod
+    def from_list(data):
+        node = SuffixTrie(tuple(data[0]) if data[0] else None)
+        node.children = {letter: SuffixTrie.from_list(child) for letter, child in data[1].items()}
+        return node
+
+
+class SuffixLemmatizer:
+    """ Lemmatizer of a part of speech by suffix rules learned from its lookup table. """
+
+    def __init__(self, trie=None):
+        self.trie = trie or SuffixTrie()
+
+    @staticmethod
+    def learn(pairs, lemmas=(), context=2, min_count=2):
+        """
+        Learn the rules of the (inflected form, lemma) pairs.
+
+        :param lemmas: known lemmas besides the ones of the pairs (e.g. the lemmas without other forms)
+        """
+
+        pairs = list(pairs)
+        identities = {lemma: lemma for lemma in set(lemmas) | {lemma for _, lemma in pairs}}
+
+        votes = defaultdict(Counter)
+        for form, lemma in pairs + list(identities.items()):
+            prefix = 0
+            while prefix < min(len(form), len(lemma)) and form[prefix] == lemma[prefix]:
+                prefix += 1
+
+            rule = (len(form) - prefix, lemma[prefix:])
+            for length in range(max(rule[0], 1), min(rule[0] + context, len(form)) + 1):
+                votes[form[len(form) - length:]][rule] += 1
+
+        root = SuffixTrie()
+        for suffix in sorted(votes, key=len):
+            rule, count = votes[suffix].most_common(1)[0]
+            if count < min_count:
+                continue
+
+            # the parent suffixes are inserted first, since the suffixes are sorted by length
+            node, inherited = root, root.rule
+            for letter in reversed(suffix):
+                node = node.children.setdefault(letter, SuffixTrie())
+                inherited = node.rule or inherited
+            if rule != (inherited or IDENTITY):
+                node.rule = rule
+
+        SuffixLemmatizer.__prune(root)
+        return SuffixLemmatizer(root)
+
+    @staticmethod
+    def __prune(node):
+        """ Remove the subtrees without rules. """
+
+        for letter, child in list(node.children.items()):
+            if not SuffixLemmatizer.__prune(child):
+                del node.children[letter]
+
+        return node.rule is not None or bool(node.children)
+
+    def lemmatize(self, word):
+        """
+        Apply the rule of the longest known suffix of the word.
+
+        :return the lemma or None if no rule matches the word
+        """
+
+        node, rule = self.trie, None
+        for letter in reversed(word):
+            node = node.children.get(letter)
+            if node is None:
+                break
+            if node.rule and len(word) - node.rule[0] >= MIN_STEM:
+                rule = node.rule
+
+        if rule is None:
+            return None
+        strip, append = rule
+        return word[:len(word) - strip] + append
+
+    def rewritten(self, lemmas, table=None):
+        """ The lemmas changed by a lookup in a table followed by the rules (like in the SyntacticParser). """
+
+        table = table or {}
+        return sorted(lemma for lemma in lemmas if (table.get(lemma) or self.lemmatize(lemma) or lemma) != lemma)
+
+    def size(self):
+        """ Number of nodes of the trie. """
+
+        nodes, count = [self.trie], 0
+        while nodes:
+            node = nodes.pop()
+            count += 1
+            nodes.extend(node.children.values())
+
+        return count
+
+
+def save_rules(lemmatizers, file=RULES_FILE):
+    """ Save the suffix lemmatizers of several lookup tables, by table name. """
+
+    with open(file, 'w', encoding='utf-8') as f:
+        json.dump({table: lemmatizer.trie.to_list() for table, lemmatizer in lemmatizers.items()}, f,
+                  ensure_ascii=False, separators=(',', ':'))
+
+
+def load_rules(file=RULES_FILE):
+    with open(file, 'r', encoding='utf-8') as f:
+        return {table: SuffixLemmatizer(SuffixTrie.from_list(trie)) for table, trie in json.load(f).items()}
@@ -0,0 +1,116 @@
+"""
+Streaming access to the annotated dataset of the syntactic parser.
+
+The examples are stored as sharded JSONL files (data/syntactic/<split>/<split>-NNNNN.jsonl), one example per line:
+{"text": "Mihai este foarte înalt", "heads": [1, 1, 3, 1], "deps": ["cine", "ROOT", "-", "cum este"]}
+Only one shard at a time is held in memory. The dataset is also written at runtime, with the corrections submitted for
+the online updates of the parser (see parser_updater.py).
+"""
+
+import json
+import random
+from pathlib import Path
+
+DATA_DIR = Path(__file__).parent / 'drafts' / 'data' / 'syntactic'
+TRAIN_PATH = DATA_DIR / 'train'
+TEST_PATH = DATA_DIR / 'test'
+CORRECTIONS_PATH = DATA_DIR / 'corrections'
+
+SHARD_SIZE = 10000
+
+# syntactic questions (labels of the dependencies)
+dependency_types = [
+    "-",
+    "prep",
+    "ROOT",
+    "cine",
+    "care",
+    "ce fel de",
+    "ce",
+    "pe cine",
+    "unde",
+    "când",
+    "cât timp",
+    "la cât timp",
+    "cât de des",
+    "cum este",
+    "care este",
+    "al cui",
+    "cât",
+    "cui",
+]
+
+
+def shard_files(path):
+    """ Return the shards of a dataset given as a single .jsonl file or as a directory of shards. """
+
+    path = Path(path)
+    if path.is_dir():
+        return sorted(path.glob('*.jsonl'))
+    return [path]
+
+
+def read_shard(file):
+    """ Yield the (text, {"heads", "deps"}) examples of a shard. """
+
+    with open(file, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                example = json.loads(line)
+                yield example['text'], {'heads': example['heads'], 'deps': example['deps']}
+
+
+def read_examples(path):
+    """ Yield all the examples of a dataset, in order. """
+
+    for file in shard_files(path):
+        yield from read_shard(file)
+
+
+def shuffled_examples(path, rng=random):
+    """ Yield all the examples of a dataset, visiting the shards and the examples of each shard in random order. """
+
+    files = shard_files(path)
+    rng.shuffle(files)
+
+    for file in files:
+        examples = list(read_shard(file))
+        rng.shuffle(examples)
+        yield from examples
+
+
+def append_example(text, annotations, file):
+    """ Append an example at the end of a shard. """
+
+    Path(file).parent.mkdir(parents=True, exist_ok=True)
+    with open(file, 'a', encoding='utf-8') as f:
+        f.write(json.dumps({'text': text, 'heads': annotations['heads'], 'deps': annotations['deps']},
+                           ensure_ascii=False) + '\n')
+
+
+def write_examples(examples, path, shard_size=SHARD_SIZE):
+    """
+    Write (text, {"heads", "deps"}) examples into shards of at most `shard_size` examples,
+    named after the directory (e.g. train/train-00000.jsonl).
+
+    :return the number of written examples
+    """
+
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    count = 0
+    out = None
+    for text, annotations in examples:
+        if count % shard_size == 0:
+            if out:
+                out.close()
+            out = open(path / f'{path.name}-{count // shard_size:05d}.jsonl', 'w', encoding='utf-8')
+
+        out.write(json.dumps({'text': text, 'heads': annotations['heads'], 'deps': annotations['deps']},
+                             ensure_ascii=False) + '\n')
+        count += 1
+
+    if out:
+        out.close()
+    return count
@@ -1,15 +1,34 @@
+import os
 import typing
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import Any, Optional, Text, Dict, List, Type
 
 from rasa.nlu.components import Component
 from rasa.nlu.config import RasaNLUModelConfig
 from rasa.nlu.training_data import Message, TrainingData
 
+import numpy as np
 import spacy
+from spacy.attrs import HEAD, DEP, TAG
 from spacy.tokens import Span
 from spacy.lookups import Lookups
 from spacy.lang.ro import tag_map
 
+from metrics import NLU_STAGE_LATENCY, LEMMATIZER_LOOKUPS, PARSER_PATHS, FAST_PATH_VERIFICATIONS, SKIPPED_PARSES, \
+    DISCARDED_PARSES, timed
+from parser_updater import ParserUpdater
+from lemma_trie import LemmaTrie, TRIE_SUFFIX
+from suffix_lemmatizer import RULES_FILE, load_rules
+from template_parser import TemplateMatcher
+from vectors import mmap_vectors
+
+MODEL_PATH = '../models/spacy-syntactic'
+LOOKUPS_PATH = './data/lookups'
+
+# message attribute of the semantic roles computed concurrently (see SemanticRolesJoin)
+PENDING_SEMANTIC_ROLES = "pending_semantic_roles"
+
 if typing.TYPE_CHECKING:
     from rasa.nlu.model import Metadata
 
@@ -29,7 +48,26 @@ class SyntacticParser(Component):
     # these values can be overwritten in the pipeline configuration
     # of the model. The component should choose sensible defaults
     # and should be able to create reasonable results with the defaults.
-    defaults = {}
+    defaults = {
+        # fine-tune the parser in the background on the corrections sent to /webhooks/corrections/
+        "online_updates": False,
+        # directory where the accepted online updates of the model are saved (not saved if None)
+        "online_updates_output": None,
+        # parse the utterances with a rigid shape with sentence templates instead of the neural parser:
+        # "off", "on" or "verify" (parse with both, count the disagreements and keep the neural parse)
+        "fast_path": "off",
+        # minimum number of NLU training examples matched by a template for using it
+        "fast_path_min_support": 1,
+        # intents whose actions read the semantic roles (the other messages are not parsed); None to parse all
+        "role_intents": ["store_attr", "store_following_attr", "store_location", "store_timestamp",
+                         "get_attr", "get_location", "get_timestamp", "get_subject", "get_specifier"],
+        # parse the messages of the other intents too if the intent classifier is less confident than this
+        "role_intents_min_confidence": 0.5,
+        # parse in a worker thread while the next components of the pipeline (featurizers, DIETClassifier) run;
+        # the semantic roles are set by the SemanticRolesJoin component. The parse usually starts before the intent is
+        # known, so this trades the parses avoided by role_intents for latency
+        "concurrent": False,
+    }
 
     # Defines what language(s) this component can handle.
     # This attribute is designed for instance method: `can_handle_language`.
@@ -39,12 +77,25 @@ class SyntacticParser(Component):
 
     @staticmethod
     def __load_lemmas():
-        # extract lemma lookup tables from the compressed binary file (.bin)
-        lookups = spacy.lookups.Lookups()
-        lookups.from_disk('./data/lookups')
-        noun_lemmas = lookups.get_table("noun-lemmas")
-        prop_noun_lemmas = lookups.get_table("prop-noun-lemmas")
-        verb_lemmas = lookups.get_table("verb-lemmas")
+        lookups = None
+
+        def load_table(name):
+            nonlocal lookups
+
+            # prefer the compressed automaton of the table (see lemma_trie.py)
+            trie_file = os.path.join(LOOKUPS_PATH, name + TRIE_SUFFIX)
+            if os.path.exists(trie_file):
+                return LemmaTrie.from_disk(trie_file)
+
+            # extract lemma lookup tables from the compressed binary file (.bin)
+            if lookups is None:
+                lookups = spacy.lookups.Lookups()
+                lookups.from_disk(LOOKUPS_PATH)
+            return lookups.get_table(name)
+
+        noun_lemmas = load_table("noun-lemmas")
+        prop_noun_lemmas = load_table("prop-noun-lemmas")
+        verb_lemmas = load_table("verb-lemmas")
 
         # manually create a pronoun lemma lookup table
         pronouns = {'meu': 'eu', 'mea': 'eu', 'mei': 'eu', 'mele': 'eu',
@@ -58,14 +109,38 @@ class SyntacticParser(Component):
             tag_map.PRON: pron_lemmas,
         }
 
+    @staticmethod
+    def __load_suffix_rules():
+        # suffix rules learned from the lookup tables (see drafts/compile_lemmas.py), used for the missing words
+        rules = load_rules() if os.path.exists(RULES_FILE) else {}
+
+        return {
+            tag_map.NOUN: rules.get("noun-lemmas"),
+            tag_map.PROPN: rules.get("prop-noun-lemmas"),
+            tag_map.VERB: rules.get("verb-lemmas"),
+        }
+
     def __init__(self, component_config: Optional[Dict[Text, Any]] = None) -> None:
         super().__init__(component_config)
 
         # initialize spaCy model used for syntactic-semantic parsing
-        self.nlp_spacy = spacy.load('../models/spacy-syntactic')
+        self.nlp_spacy = mmap_vectors(spacy.load(MODEL_PATH), MODEL_PATH)
 
         # initialize the lemmatizer
         self.lemmas = SyntacticParser.__load_lemmas()
+        self.suffix_rules = SyntacticParser.__load_suffix_rules()
+
+        # templates of the fast path (compiled from the NLU data only if the fast path is enabled)
+        self.templates = None
+        if self.component_config["fast_path"] in ["on", "verify"]:
+            self.templates = TemplateMatcher.from_nlu_data(min_support=self.component_config["fast_path_min_support"])
+
+        # started with the first processed message, so that it only runs when serving
+        self.updater = None
+
+        # a single worker, since the spaCy pipeline is not thread-safe
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="syntactic-parser") \
+            if self.component_config["concurrent"] else None
 
     def train(
             self,
@@ -106,7 +181,9 @@ class SyntacticParser(Component):
         """
         Get the lemma for the given inflected word.
 
-        :return the word's lemma ot the same word if the lemma is not available in the lookup tables
+        The lookup tables are searched first and the suffix rules are used for the nouns and verbs missing from them.
+
+        :return the word's lemma ot the same word if the lemma is not available
         """
 
         tag = token.tag_.split('__')[0]  # extract the compact tag
@@ -115,19 +192,23 @@ class SyntacticParser(Component):
 
         # proper noun
         if word in self.lemmas[tag_map.PROPN]:
+            LEMMATIZER_LOOKUPS.inc("table")
             return self.lemmas[tag_map.PROPN][word]
 
         # POS = pronoun
         if word in self.lemmas[tag_map.PRON]:
             return self.lemmas[tag_map.PRON][word]
 
-        # POS = noun
-        if pos == tag_map.NOUN:
-            return self.lemmas[tag_map.NOUN].get(word, word)
+        # POS = noun/proper noun/verb
+        if pos in [tag_map.NOUN, tag_map.PROPN, tag_map.VERB]:
+            if word in self.lemmas[pos]:
+                LEMMATIZER_LOOKUPS.inc("table")
+                return self.lemmas[pos][word]
 
-        # POS = verb
-        if pos == tag_map.VERB:
-            return self.lemmas[tag_map.VERB].get(word, word)
+            rules = self.suffix_rules[pos]
+            lemma = rules.lemmatize(word) if rules else None
+            LEMMATIZER_LOOKUPS.inc("suffix" if lemma else "none")
+            return lemma or word
 
         # TODO numeral - doi/două -> 2
 
@@ -205,8 +286,97 @@ class SyntacticParser(Component):
         of ANY component and on any context attributes created by a call to :meth:`components.Component.process`
         of components previous to this one."""
 
+        if self.updater is None and self.component_config["online_updates"]:
+            self.updater = ParserUpdater(self, MODEL_PATH, self.component_config["online_updates_output"])
+            self.updater.start()
+
+        if self.executor:
+            # the intent is not known yet, so the parse is started anyway and discarded by the join if not needed
+            future = self.executor.submit(self.semantic_roles, message.text)
+            message.set(PENDING_SEMANTIC_ROLES, partial(self.join_semantic_roles, future))
+            return
+
+        if not self.__needs_semantic_roles(message):
+            SKIPPED_PARSES.inc(message.get("intent")["name"])
+            message.set("semantic_roles", [], add_to_output=True)
+            return
+
+        # add extracted entities to the message
+        message.set("semantic_roles", self.semantic_roles(message.text), add_to_output=True)
+
+    def join_semantic_roles(self, future, message):
+        """ Wait for the semantic roles computed concurrently and add them to the message. """
+
+        if not self.__needs_semantic_roles(message):
+            # the parse is only avoided if the worker thread didn't start it yet
+            skipped = future.cancel()
+            (SKIPPED_PARSES if skipped else DISCARDED_PARSES).inc(message.get("intent")["name"])
+            message.set("semantic_roles", [], add_to_output=True)
+            return
+
+        message.set("semantic_roles", future.result(), add_to_output=True)
+
+    def semantic_roles(self, text):
+        """ Parse the phrase (with a template or the neural parser) and extract its semantic roles. """
+
+        text = text.lower()
+        fast_path = self.component_config["fast_path"]
+
         # parse the phrase
-        doc = self.nlp_spacy(message.text.lower())
+        template_doc = None
+        if fast_path in ["on", "verify"]:
+            with timed(NLU_STAGE_LATENCY, "template"):
+                template_doc = self.parse_with_template(text)
+
+        if template_doc is not None and fast_path == "on":
+            PARSER_PATHS.inc("template")
+            doc = template_doc
+        else:
+            PARSER_PATHS.inc("neural")
+            with timed(NLU_STAGE_LATENCY, "parse"):
+                doc = self.nlp_spacy(text)
+
+        with timed(NLU_STAGE_LATENCY, "roles"):
+            semantic_roles = self.extract_semantic_roles(doc)
+
+        if template_doc is not None and fast_path == "verify":
+            agree = self.extract_semantic_roles(template_doc) == semantic_roles
+            FAST_PATH_VERIFICATIONS.inc("agree" if agree else "disagree")
+
+        return semantic_roles
+
+    def __needs_semantic_roles(self, message):
+        """ Check if the actions of the intent predicted upstream (by DIETClassifier) may read the semantic roles. """
+
+        role_intents = self.component_config["role_intents"]
+        intent = message.get("intent")
+        if role_intents is None or not intent or not intent.get("name"):
+            return True
+
+        return intent["name"] in role_intents or \
+            intent.get("confidence", 0) < self.component_config["role_intents_min_confidence"]
+
+    def parse_with_template(self, text):
+        """
+        Build the dependency tree of a phrase matched by a sentence template, without running the neural parser.
+
+        :return the parsed Doc or None if the phrase doesn't match a template
+        """
+
+        doc = self.nlp_spacy.make_doc(text)
+        match = self.templates.match([token.text for token in doc])
+        if match is None:
+            return None
+
+        heads, deps, tags = match
+        strings = self.nlp_spacy.vocab.strings
+        array = np.array([[head - i, strings.add(dep), strings.add(tag)]
+                          for i, (head, dep, tag) in enumerate(zip(heads, deps, tags))], dtype=np.int64)
+        doc.from_array([HEAD, DEP, TAG], array.astype(np.uint64))
+        return doc
+
+    def extract_semantic_roles(self, doc):
+        """ Build the semantic entities of the phrase from its dependency tree. """
 
         semantic_roles = []
         inferred_subj = None
@@ -244,10 +414,28 @@ class SyntacticParser(Component):
         if inferred_subj and not any(ent['question'] == 'cine' for ent in semantic_roles):
             semantic_roles.append(inferred_subj)
 
-        # add extracted entities to the message
-        message.set("semantic_roles", semantic_roles, add_to_output=True)
+        return semantic_roles
 
     def persist(self, file_name: Text, model_dir: Text) -> Optional[Dict[Text, Any]]:
         """Persist this component to disk for future loading."""
 
         pass
+
+
+class SemanticRolesJoin(Component):
+    """
+    Component that waits for the semantic roles computed in a worker thread by the SyntacticParser component
+    (with `concurrent: true`), placed after the intent classifier.
+    """
+
+    name = "SemanticRolesJoin"
+
+    @classmethod
+    def required_components(cls) -> List[Type[Component]]:
+        return [SyntacticParser]
+
+    def process(self, message: Message, **kwargs: Any) -> None:
+        join = message.get(PENDING_SEMANTIC_ROLES)
+        if join is not None:
+            del message.data[PENDING_SEMANTIC_ROLES]
+            join(message)
@@ -0,0 +1,177 @@
+"""
+Rule-based fast path of the syntactic parser, for the utterances with a rigid shape ("unde e X", "X e pe Y", ...).
+
+The sentence templates of the synthetic data generator (sentence_templates.py) already give the heads and
+syntactic questions of their tokens. The templates that match examples of the NLU training data (data/nlu.md) are
+compiled into an index keyed by the shape of the utterance (its template words and slots), so matching an utterance
+costs a dict lookup and a check of the words filling the slots. A match is only accepted when all the matching
+templates give the same parse; otherwise the utterance is left to the neural parser.
+
+Compare the two paths on the parser test set (run from the rasa-bot folder):
+    python -m template_parser -t drafts/data/syntactic/test
+"""
+
+import re
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import plac
+
+from sentence_templates import TEMPLATES, SLOT_VALUES, A_FI
+
+NLU_DATA = './data/nlu.md'
+
+# detailed POS tags given to the slots and to the root (the tags only matter for lemmatizing the nouns and verbs and
+# for inferring the subject from the person of the root verb)
+SLOT_TAGS = {
+    "ART": "Ncfsry",
+    "NOUN": "Ncfsrn",
+    "PROPN": "Np",
+    "OWNER": "Np",
+    "NUM": "Mc",
+    "TIME": "Rgp",
+    "COLOR": "Afpms-n",
+}
+ROOT_TAG = "Vmip3s"
+OTHER_TAG = "X"
+
+A_FI_FORMS = {form for forms, _ in A_FI.values() for form in forms}
+
+# words that never fill a noun slot
+CLOSED_CLASS = A_FI_FORMS | {
+    "eu", "tu", "el", "ea", "noi", "voi", "ei", "ele", "meu", "mea", "mei", "mele", "tău", "ta", "tale", "lui", "lor",
+    "său", "sa", "ce", "cine", "care", "unde", "când", "cum", "cât", "câtă", "câți", "câte", "nu", "da", "și",
+    "sau", "iar", "dar", "un", "o", "niște", "cel", "cea", "cei", "cele", "acesta", "aceasta", "asta", "ăsta",
+    "acolo", "aici", "de", "din", "pe", "în", "la", "cu", "sub", "spre", "lângă", "după", "pentru", "fără",
+    "până", "a", "al", "ai", "am", "au", "ați", "se", "mi", "îmi", "te", "îți", "își", "ne", "vă", "foarte",
+    "mai", "deja", "încă",
+}
+
+SLOT_PREDICATES = {
+    "ART": lambda word: word.isalpha() and word not in CLOSED_CLASS,
+    "NOUN": lambda word: word.isalpha() and word not in CLOSED_CLASS,
+    "PROPN": lambda word: word.isalpha() and word not in CLOSED_CLASS,
+    "OWNER": lambda word: word.isalpha() and word not in CLOSED_CLASS and word.endswith(("ei", "ăi", "ului")),
+    "COLOR": lambda word: word.isalpha() and word not in CLOSED_CLASS,
+    "NUM": str.isdigit,
+    "TIME": lambda word: word in SLOT_VALUES["TIME"],
+    "A_FI": lambda word: word in A_FI_FORMS,
+}
+
+# shape symbol of the words that fill the noun, number and time slots
+ANY_WORD = "*"
+
+
+class Template:
+    """ Sentence template with the heads, syntactic questions and POS tags of its tokens. """
+
+    def __init__(self, text, heads, deps):
+        self.tokens = text.split(' ')
+        self.heads = heads
+        self.deps = deps
+        self.tags = [SLOT_TAGS.get(token[1:-1], OTHER_TAG) if dep != "ROOT" else ROOT_TAG
+                     for token, dep in zip(self.tokens, deps)]
+
+    def shape(self):
+        return tuple(token if token == "{A_FI}" or not token.startswith("{") else ANY_WORD for token in self.tokens)
+
+    def matches(self, words):
+        return all(SLOT_PREDICATES[token[1:-1]](word) if token.startswith("{") else token == word
+                   for token, word in zip(self.tokens, words))
+
+
+class TemplateMatcher:
+    """ Index of the templates by the shape of the utterances they match. """
+
+    def __init__(self, templates):
+        self.templates = templates
+        self.literals = {token for template in templates for token in template.tokens if not token.startswith("{")}
+        self.index = defaultdict(list)
+        for template in templates:
+            self.index[template.shape()].append(template)
+
+    @staticmethod
+    def from_nlu_data(file=NLU_DATA, min_support=1, templates=TEMPLATES):
+        """ Keep the templates that match at least `min_support` examples of the NLU training data. """
+
+        support = {i: 0 for i in range(len(templates))}
+        all_templates = TemplateMatcher([Template(*template) for template in templates])
+        for words in read_nlu_examples(file):
+            for template in all_templates.index.get(all_templates.shape(words), []):
+                if template.matches(words):
+                    support[all_templates.templates.index(template)] += 1
+
+        frequent = sorted((i for i in support if support[i] >= min_support), key=lambda i: -support[i])
+        return TemplateMatcher([all_templates.templates[i] for i in frequent])
+
+    def shape(self, words):
+        return tuple(word if word in self.literals else "{A_FI}" if word in A_FI_FORMS else ANY_WORD
+                     for word in words)
+
+    def match(self, words):
+        """
+        Find the parse of an utterance (list of lowercase words).
+
+        :return the (heads, deps, tags) of the words or None if no template or several different templates match
+        """
+
+        matches = [template for template in self.index.get(self.shape(words), []) if template.matches(words)]
+        if not matches or any((t.heads, t.deps) != (matches[0].heads, matches[0].deps) for t in matches[1:]):
+            return None
+
+        return matches[0].heads, matches[0].deps, matches[0].tags
+
+
+def read_nlu_examples(file):
+    """ Words of the examples of the NLU training data (Markdown format), without entity annotations. """
+
+    with open(file, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.startswith('- '):
+                text = re.sub(r'\[([^\]]*)\]\([^)]*\)', r'\1', line[2:].strip()).lower()
+                yield re.sub(r'[?!.,]', ' ', text).split()
+
+
+@plac.annotations(
+    test_path=("Annotated examples (dataset directory or shard)", "option", "t", Path),
+    min_support=("Minimum number of NLU examples matched by a template", "option", "s", int),
+)
+def main(test_path=Path('drafts/data/syntactic/test'), min_support=1):
+    from syntactic_dataset import read_examples
+    from syntactic_parser import SyntacticParser
+
+    parser = SyntacticParser({"fast_path": "verify", "fast_path_min_support": min_support})
+    print(f'{len(parser.templates.templates)} templates')
+
+    matched = same_roles = correct_template = correct_neural = 0
+    template_time = neural_time = 0.0
+    examples = list(read_examples(test_path))
+    for text, annotations in examples:
+        text = text.lower()
+        start = time.perf_counter()
+        template_doc = parser.parse_with_template(text)
+        if template_doc is None:
+            continue
+        template_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        neural_doc = parser.nlp_spacy(text)
+        neural_time += time.perf_counter() - start
+
+        gold = (annotations["heads"], annotations["deps"])
+        matched += 1
+        same_roles += parser.extract_semantic_roles(template_doc) == parser.extract_semantic_roles(neural_doc)
+        correct_template += ([t.head.i for t in template_doc], [t.dep_ for t in template_doc]) == gold
+        correct_neural += ([t.head.i for t in neural_doc], [t.dep_ for t in neural_doc]) == gold
+
+    print(f'matched: {matched}/{len(examples)} sentences')
+    if matched:
+        print(f'same semantic roles: {same_roles / matched:.3f}')
+        print(f'exact parses: template {correct_template / matched:.3f}, neural {correct_neural / matched:.3f}')
+        print(f'time per matched sentence: template {template_time / matched * 1000:.3f} ms, '
+              f'neural {neural_time / matched * 1000:.3f} ms')
+
+
+if __name__ == "__main__":
+    plac.call(main)
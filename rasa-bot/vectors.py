@@ -0,0 +1,21 @@
+"""
+Loading of the word vectors of the spaCy models used at runtime (the parser, the knowledge base embedder).
+
+The vectors table of a model saved with spaCy is a raw NumPy array (vocab/vectors), so it can be memory-mapped
+instead of read: the pages of the table are shared by the processes that load the model and only the rows in use stay
+resident. See drafts/prune_vectors.py for shrinking the table to the words of our corpora.
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+
+def mmap_vectors(nlp, model_path):
+    """ Replace the vectors table of a loaded model with a read-only memory map of the table saved in its directory. """
+
+    vectors_file = Path(model_path) / 'vocab' / 'vectors'
+    if vectors_file.exists() and nlp.vocab.vectors.size:
+        nlp.vocab.vectors.data = np.load(str(vectors_file), mmap_mode='r')
+
+    return nlp
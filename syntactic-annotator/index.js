@@ -104,15 +104,12 @@ function requestSpacyDepParse() {
     const xhttp = new XMLHttpRequest();
     xhttp.onreadystatechange = function () {
         if (this.readyState === 4 && this.status === 200) {
-            let iframe = document.getElementById('embed');
-            iframe.src = iframe.src;
+            document.getElementById('embed').innerHTML = JSON.parse(this.responseText).svg;
         }
     };
     xhttp.open("POST", "http://localhost:3333", true);
-    xhttp.setRequestHeader("Access-Control-Allow-Origin", 'http://localhost:3333/');
-    xhttp.setRequestHeader("Access-Control-Allow-Methods", "GET, PUT, POST, DELETE, HEAD, OPTIONS");
-    xhttp.setRequestHeader("Content-type", "application/x-www-form-urlencoded");
-    xhttp.send(phrase.value);
+    xhttp.setRequestHeader("Content-type", "application/json");
+    xhttp.send(JSON.stringify({text: phrase.value, svg: true}));
 }
 
 init();
\ No newline at end of file